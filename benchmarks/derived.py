@@ -0,0 +1,71 @@
+"""Micro-benchmark of the derived forecast aggregates.
+
+Compares every aggregate walking the forecast on its own, as a template
+sensor per aggregate does on each state change, with computing all of them
+in one pass over each block once per update.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.derived
+"""
+import timeit
+
+from custom_components.openweather_one_call.derived import DERIVED_KEYS, compute_derived
+from custom_components.openweather_one_call.snapshot import OneCallSnapshot
+
+from .payloads import make_payload
+
+
+def _per_aggregate(payload):
+    """Compute each aggregate with its own walk over the forecast dicts."""
+    hours = payload["hourly"][:24]
+    precipitation = round(
+        sum(
+            (hour.get("rain") or {}).get("1h", 0) + (hour.get("snow") or {}).get("1h", 0)
+            for hour in hours
+        ),
+        2,
+    )
+    gust = max(hour.get("wind_gust") or hour.get("wind_speed") for hour in hours)
+    frost = sum(1 for hour in hours if hour["temp"] < 0)
+    best = run = 0
+    for hour in hours[:12]:
+        dry = hour.get("pop", 0) <= 0.2 and not (hour.get("rain") or {}).get("1h")
+        run = run + 1 if dry else 0
+        best = max(best, run)
+    dry_start = next(
+        (hour["dt"] for hour in hours[:12] if hour.get("pop", 0) <= 0.2), None
+    )
+    heating = sum(
+        max(18 - (day["temp"]["min"] + day["temp"]["max"]) / 2, 0)
+        for day in payload["daily"]
+    )
+    cooling = sum(
+        max((day["temp"]["min"] + day["temp"]["max"]) / 2 - 18, 0)
+        for day in payload["daily"]
+    )
+    return precipitation, gust, frost, best, dry_start, heating, cooling
+
+
+def main(number: int = 2000) -> None:
+    payload = make_payload()
+    value_fns = {
+        key: (lambda key: lambda snapshot: snapshot.cached("derived", compute_derived)[key])(key)
+        for key in DERIVED_KEYS
+    }
+
+    def per_aggregate():
+        _per_aggregate(payload)
+
+    def one_pass():
+        OneCallSnapshot(payload, value_fns)
+
+    per_aggregate_us = min(timeit.repeat(per_aggregate, number=number, repeat=5)) / number * 1e6
+    one_pass_us = min(timeit.repeat(one_pass, number=number, repeat=5)) / number * 1e6
+    print(f"{len(DERIVED_KEYS)} aggregates over 24 hours and 8 days")
+    print(f"walk per aggregate: {per_aggregate_us:8.1f} us/update")
+    print(f"one pass:           {one_pass_us:8.1f} us/update ({per_aggregate_us / one_pass_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
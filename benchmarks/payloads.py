@@ -0,0 +1,160 @@
+"""Synthetic One Call 3.0 and Air Pollution payloads shaped like real responses."""
+import copy
+import random
+
+WEATHER = [
+    {"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"},
+    {"id": 803, "main": "Clouds", "description": "broken clouds", "icon": "04d"},
+    {"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"},
+]
+
+
+def make_payload(
+    now: int = 1_700_000_000,
+    minutely: bool = True,
+    hourly: bool = True,
+    daily: bool = True,
+    alerts: int = 1,
+    seed: int = 0,
+) -> dict:
+    """Return a One Call payload; blocks can be left out like with ``exclude``."""
+    rng = random.Random(seed)
+    payload = {
+        "lat": 52.52,
+        "lon": 13.405,
+        "timezone": "Europe/Berlin",
+        "timezone_offset": 3600,
+        "current": _hour(rng, now, now),
+    }
+    payload["current"].pop("pop")
+    if minutely:
+        payload["minutely"] = [
+            {"dt": now + 60 * i, "precipitation": round(max(rng.gauss(0.2, 0.4), 0), 2)}
+            for i in range(61)
+        ]
+    if hourly:
+        payload["hourly"] = [_hour(rng, now + 3600 * i, now) for i in range(48)]
+    if daily:
+        payload["daily"] = [_day(rng, now + 86400 * i) for i in range(8)]
+    if alerts:
+        payload["alerts"] = [
+            {
+                "sender_name": "Deutscher Wetterdienst",
+                "event": f"Wind gusts {i}",
+                "start": now - 3600,
+                "end": now + 7200 * (i + 1),
+                "description": "There is a risk of wind gusts. " * 120,
+                "tags": ["Wind"],
+            }
+            for i in range(alerts)
+        ]
+    return payload
+
+
+def make_air_pollution(now: int = 1_700_000_000, hours: int = 1, seed: int = 0) -> dict:
+    """Return an Air Pollution payload, the current hour or a forecast of hours."""
+    rng = random.Random(seed)
+    return {
+        "coord": {"lon": 13.405, "lat": 52.52},
+        "list": [
+            {
+                "main": {"aqi": rng.randint(1, 5)},
+                "components": {
+                    component: round(rng.uniform(0, high), 2)
+                    for component, high in (
+                        ("co", 400), ("no", 5), ("no2", 40), ("o3", 120),
+                        ("so2", 10), ("pm2_5", 30), ("pm10", 40), ("nh3", 5),
+                    )
+                },
+                "dt": now - now % 3600 + 3600 * i,
+            }
+            for i in range(hours)
+        ],
+    }
+
+
+def make_series(polls: int, seed: int = 0) -> list[dict]:
+    """Return consecutive payloads of one location over a quiet day.
+
+    Current values drift by about the noise of the API between polls and
+    forecasts are revised slightly. Every sixth poll the alert is extended.
+    """
+    rng = random.Random(seed)
+    payload = make_payload(seed=seed)
+    series = []
+    for poll in range(polls):
+        payload = copy.deepcopy(payload)
+        current = payload["current"]
+        for key in ("temp", "feels_like", "dew_point"):
+            current[key] = round(current[key] + rng.gauss(0, 0.05), 2)
+        for key in ("wind_speed", "wind_gust", "uvi"):
+            current[key] = round(max(current[key] + rng.gauss(0, 0.05), 0), 2)
+        current["wind_deg"] = (current["wind_deg"] + rng.randint(-3, 3)) % 360
+        current["pressure"] += rng.choice((-1, 0, 0, 0, 0, 1))
+        current["humidity"] = min(max(current["humidity"] + rng.randint(-1, 1), 0), 100)
+        for day in payload["daily"]:
+            for key in day["temp"]:
+                day["temp"][key] = round(day["temp"][key] + rng.gauss(0, 0.03), 2)
+            day["pop"] = round(min(max(day["pop"] + rng.gauss(0, 0.005), 0), 1), 3)
+        if poll and not poll % 6:
+            for alert in payload["alerts"]:
+                alert["end"] += 3600
+        series.append(payload)
+    return series
+
+
+def _hour(rng: random.Random, dt: int, now: int) -> dict:
+    hour = {
+        "dt": dt,
+        "sunrise": now - 20_000,
+        "sunset": now + 10_000,
+        "temp": round(rng.uniform(-5, 25), 2),
+        "feels_like": round(rng.uniform(-8, 25), 2),
+        "pressure": rng.randint(990, 1030),
+        "humidity": rng.randint(30, 100),
+        "dew_point": round(rng.uniform(-10, 15), 2),
+        "uvi": round(rng.uniform(0, 6), 2),
+        "clouds": rng.randint(0, 100),
+        "visibility": 10000,
+        "wind_speed": round(rng.uniform(0, 15), 2),
+        "wind_deg": rng.randint(0, 359),
+        "wind_gust": round(rng.uniform(0, 25), 2),
+        "pop": round(rng.random(), 2),
+        "weather": [rng.choice(WEATHER)],
+    }
+    if rng.random() < 0.4:
+        hour["rain"] = {"1h": round(rng.uniform(0.1, 3), 2)}
+    return hour
+
+
+def _day(rng: random.Random, dt: int) -> dict:
+    low = round(rng.uniform(-5, 15), 2)
+    return {
+        "dt": dt,
+        "sunrise": dt - 20_000,
+        "sunset": dt + 10_000,
+        "moonrise": dt - 5_000,
+        "moonset": dt + 30_000,
+        "moon_phase": round(rng.random(), 2),
+        "summary": "Expect a day of partly cloudy with rain",
+        "temp": {
+            "day": low + 6,
+            "min": low,
+            "max": low + 9,
+            "night": low + 1,
+            "eve": low + 4,
+            "morn": low + 2,
+        },
+        "feels_like": {"day": low + 5, "night": low, "eve": low + 3, "morn": low + 1},
+        "pressure": rng.randint(990, 1030),
+        "humidity": rng.randint(30, 100),
+        "dew_point": round(rng.uniform(-10, 15), 2),
+        "wind_speed": round(rng.uniform(0, 15), 2),
+        "wind_deg": rng.randint(0, 359),
+        "wind_gust": round(rng.uniform(0, 25), 2),
+        "weather": [rng.choice(WEATHER)],
+        "clouds": rng.randint(0, 100),
+        "pop": round(rng.random(), 2),
+        "rain": round(rng.uniform(0, 10), 2),
+        "uvi": round(rng.uniform(0, 6), 2),
+    }
@@ -0,0 +1,163 @@
+"""Recorder footprint of the integration over a day of quiet polls.
+
+Feeds the payloads of ``benchmarks.payloads.make_series`` to one config
+entry in a real Home Assistant instance with the recorder writing to
+SQLite, once with every value change and attribute recorded and once with
+the significant-change thresholds and unrecorded attributes of the
+entities. Reports the state and attribute rows written and the database
+size for both.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.recorder
+    python -m benchmarks.recorder --polls 288
+"""
+import argparse
+import asyncio
+from contextlib import ExitStack
+import os
+import tempfile
+from unittest.mock import patch
+
+from custom_components.openweather_one_call.const import DOMAIN
+from custom_components.openweather_one_call.coordinator import OpenWeatherOneCallApi
+from custom_components.openweather_one_call.snapshot import OneCallSnapshot
+
+from .payloads import make_series
+from .run import REPO_ROOT
+
+
+async def bench_recorder(polls: int) -> None:
+    """Print the recorder footprint with and without filtering."""
+    print(f"\nRecorder footprint ({polls} polls of one location)")
+    print(
+        f"{'':>10} {'states':>7} {'attr rows':>10} {'attr KiB':>9} {'db KiB':>8}"
+    )
+    results = {}
+    for label, filtered in (("unfiltered", False), ("filtered", True)):
+        results[label] = result = await _run(polls, filtered)
+        print(
+            f"{label:>10} {result['states']:>7} {result['attribute_rows']:>10} "
+            f"{result['attribute_bytes'] / 1024:>9.1f} {result['db_bytes'] / 1024:>8.1f}"
+        )
+    before, after = results["unfiltered"], results["filtered"]
+    print(
+        f"{'saved':>10} {1 - after['states'] / before['states']:>7.1%} "
+        f"{1 - after['attribute_rows'] / before['attribute_rows']:>10.1%} "
+        f"{1 - after['attribute_bytes'] / before['attribute_bytes']:>9.1%} "
+        f"{1 - after['db_bytes'] / before['db_bytes']:>8.1%}"
+    )
+
+
+async def _run(polls: int, filtered: bool) -> dict:
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import bootstrap, runner
+    from homeassistant.components.recorder import get_instance
+    from homeassistant.components.recorder.db_schema import StateAttributes, States
+    from homeassistant.components.recorder.util import session_scope
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.helpers.entity import Entity
+    from sqlalchemy import func
+
+    config_dir = tempfile.mkdtemp(prefix="owm-bench-")
+    os.symlink(
+        os.path.join(REPO_ROOT, "custom_components"),
+        os.path.join(config_dir, "custom_components"),
+    )
+    db_path = os.path.join(config_dir, "bench.db")
+    with open(os.path.join(config_dir, "configuration.yaml"), "w") as file:
+        file.write(
+            "homeassistant:\n  time_zone: UTC\nlogger:\n  default: critical\n"
+            f"recorder:\n  db_url: sqlite:///{db_path}\n  commit_interval: 0\n"
+        )
+
+    payloads = iter(make_series(polls + 1))
+
+    async def fetch_shared(self, consumer, exclude=(), max_age=0, optional=()):
+        return next(payloads)
+
+    with ExitStack() as stack:
+        stack.enter_context(
+            patch.object(OpenWeatherOneCallApi, "fetch_shared", fetch_shared)
+        )
+        if not filtered:
+            changed_keys = OneCallSnapshot.changed_keys
+            stack.enter_context(
+                patch.object(
+                    OneCallSnapshot,
+                    "changed_keys",
+                    lambda self, previous, significant_changes=None: changed_keys(
+                        self, previous
+                    ),
+                )
+            )
+            for cls in _entity_classes():
+                stack.enter_context(
+                    patch.object(
+                        cls, f"_{Entity.__name__}__combined_unrecorded_attributes", frozenset()
+                    )
+                )
+
+        hass = await bootstrap.async_setup_hass(
+            runner.RuntimeConfig(config_dir=config_dir, skip_pip=True)
+        )
+        # The recorder only writes once Home Assistant has started
+        await hass.async_start()
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Location",
+            data={
+                "name": "Location",
+                "api_key": "benchmark",
+                "latitude": 52.52,
+                "longitude": 13.405,
+                "max_daily_requests": 1_000_000,
+            },
+            source="user",
+            unique_id="benchmark-recorder",
+        )
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        for coordinator in hass.data[DOMAIN][entry.entry_id]:
+            for _ in range(polls):
+                await coordinator.async_refresh()
+                await hass.async_block_till_done()
+
+        recorder = get_instance(hass)
+        await recorder.async_block_till_done()
+
+        def count() -> dict:
+            with session_scope(session=recorder.get_session(), read_only=True) as session:
+                return {
+                    "states": session.query(func.count(States.state_id)).scalar(),
+                    "attribute_rows": session.query(
+                        func.count(StateAttributes.attributes_id)
+                    ).scalar(),
+                    "attribute_bytes": session.query(
+                        func.sum(func.length(StateAttributes.shared_attrs))
+                    ).scalar(),
+                }
+
+        result = await recorder.async_add_executor_job(count)
+        await hass.async_stop()
+    result["db_bytes"] = os.path.getsize(db_path)
+    return result
+
+
+def _entity_classes() -> list[type]:
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.openweather_one_call import binary_sensor, sensor
+
+    return [
+        sensor.OpenWeatherOneCallAlertSensor,
+        sensor.OpenWeatherOneCallMetricSensor,
+        binary_sensor.OpenWeatherOneCallBinarySensor,
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=144)
+    asyncio.run(bench_recorder(parser.parse_args().polls))
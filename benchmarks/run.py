@@ -0,0 +1,282 @@
+"""Offline benchmark suite for the One Call integration.
+
+Starts the stand-in server from ``benchmarks.server`` in a subprocess, so
+its CPU time is not counted, and points the integration at it by replacing
+``API_ENDPOINT`` and ``DATASET_ENDPOINTS`` in the coordinator module. Reports
+
+* fetch latency, payload size and decode time per payload profile,
+* the same under injected errors, with the retries it took,
+* connection setup, time to first byte, transfer time and bytes on the wire
+  with a connection per request and with the dedicated transport,
+* startup time, memory and per-update entity CPU for 1, 10 and 100
+  config entries in a real Home Assistant instance.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --entries 1 10 --updates 5 --latency 0.05
+
+The stand-in serves plain HTTP on the loopback interface, so connection
+setup there has no TLS handshake and no network round trips.
+"""
+import argparse
+import asyncio
+from contextlib import asynccontextmanager
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiohttp
+
+from custom_components.openweather_one_call import coordinator as coordinator_module
+from custom_components.openweather_one_call.const import DOMAIN
+from custom_components.openweather_one_call.coordinator import OpenWeatherOneCallApi
+from custom_components.openweather_one_call.transport import create_transport, trace_config
+
+from .server import PROFILES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@asynccontextmanager
+async def stand_in(
+    profile: str = "full",
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    compress: bool = False,
+):
+    """Run the stand-in server in a subprocess and point the integration at it."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.server",
+        "--profile", profile,
+        "--latency", str(latency),
+        "--error-rate", str(error_rate),
+        "--port", "0",
+        *(["--compress"] if compress else []),
+        cwd=REPO_ROOT,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    url = (await process.stdout.readline()).decode().strip()
+    original = coordinator_module.API_ENDPOINT, coordinator_module.DATASET_ENDPOINTS
+    base = url.rpartition("/data/")[0]
+    coordinator_module.API_ENDPOINT = url
+    coordinator_module.DATASET_ENDPOINTS = {
+        dataset: base + "/data/" + endpoint.rpartition("/data/")[2]
+        for dataset, endpoint in original[1].items()
+    }
+    try:
+        yield url
+    finally:
+        coordinator_module.API_ENDPOINT, coordinator_module.DATASET_ENDPOINTS = original
+        process.terminate()
+        await process.wait()
+
+
+async def bench_fetch(requests: int, latency: float, error_rate: float) -> None:
+    """Measure fetch latency and decode time of OpenWeatherOneCallApi."""
+    print(f"\nFetch ({requests} requests, {latency * 1000:.0f} ms latency, "
+          f"{error_rate:.0%} errors)")
+    print(
+        f"{'profile':<8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'KiB':>8} "
+        f"{'decode ms':>10} {'failed':>7}"
+    )
+    for profile in PROFILES:
+        async with stand_in(profile, latency, error_rate), aiohttp.ClientSession() as session:
+            api = OpenWeatherOneCallApi(session, "benchmark", 52.52, 13.405)
+            latencies = []
+            failed = 0
+            for _ in range(requests):
+                start = time.perf_counter()
+                try:
+                    await api.fetch_data(exclude=())
+                except coordinator_module.ApiError:
+                    failed += 1
+                    api.breaker.record_success()  # Measure every request
+                    continue
+                latencies.append(time.perf_counter() - start)
+            done = requests - failed
+            print(
+                f"{profile:<8} {_ms(statistics.median(latencies)):>8.2f} "
+                f"{_ms(_p95(latencies)):>8.2f} {_ms(max(latencies)):>8.2f} "
+                f"{api.metrics.last_payload_bytes / 1024:>8.1f} "
+                f"{_ms(api.metrics.decode.total / max(done, 1)):>10.3f} {failed:>7}"
+            )
+
+
+async def bench_transport(requests: int, latency: float) -> None:
+    """Compare a connection per request with the dedicated transport."""
+    print(f"\nTransport ({requests} requests, {latency * 1000:.0f} ms latency, full profile)")
+    print(
+        f"{'transport':<28} {'p50 ms':>8} {'connect ms':>11} {'ttfb ms':>8} "
+        f"{'transfer ms':>12} {'wire KiB':>9} {'reused':>7}"
+    )
+    # Home Assistant's shared pool closes idle connections after 15 seconds,
+    # so polls minutes apart open a new connection like force_close does
+    transports = (
+        ("connection per request", False, _per_request_session),
+        ("connection per request, gzip", True, _per_request_session),
+        ("dedicated, gzip", True, create_transport),
+    )
+    for name, compress, make_session in transports:
+        async with stand_in("full", latency, compress=compress), make_session() as session:
+            api = OpenWeatherOneCallApi(session, "benchmark", 52.52, 13.405)
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                await api.fetch_data(exclude=())
+                latencies.append(time.perf_counter() - start)
+            metrics = api.metrics
+            print(
+                f"{name:<28} {_ms(statistics.median(latencies)):>8.2f} "
+                f"{_ms(_mean(metrics.connect)):>11.3f} {_ms(_mean(metrics.ttfb)):>8.3f} "
+                f"{_ms(_mean(metrics.transfer)):>12.3f} "
+                f"{metrics.total_wire_bytes / requests / 1024:>9.1f} "
+                f"{metrics.connections_reused:>7}"
+            )
+
+
+def _per_request_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(force_close=True), trace_configs=[trace_config()]
+    )
+
+
+def _mean(histogram) -> float:
+    return histogram.total / histogram.count if histogram.count else 0.0
+
+
+async def bench_entries(counts: list[int], updates: int, latency: float) -> None:
+    """Measure startup, memory and entity CPU for several config entries."""
+    print(f"\nConfig entries ({updates} updates each, full profile)")
+    print(
+        f"{'entries':>7} {'entities':>9} {'startup s':>10} {'warm s':>8} "
+        f"{'KiB/entry':>10} {'dispatch us/entity':>19} {'written':>8}"
+    )
+    async with stand_in("full", latency):
+        for count in counts:
+            result = await _run_entries(count, updates, trace_memory=False)
+            memory = await _run_entries(count, 0, trace_memory=True)
+            print(
+                f"{count:>7} {result['entities']:>9} {result['startup']:>10.3f} "
+                f"{result['warm']:>8.3f} {memory['memory'] / count / 1024:>10.1f} "
+                f"{result['dispatch_us']:>19.2f} {result['written']:>8.1%}"
+            )
+
+
+async def _run_entries(count: int, updates: int, trace_memory: bool) -> dict:
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import bootstrap, runner
+    from homeassistant.config_entries import ConfigEntry
+
+    config_dir = tempfile.mkdtemp(prefix="owm-bench-")
+    os.symlink(
+        os.path.join(REPO_ROOT, "custom_components"),
+        os.path.join(config_dir, "custom_components"),
+    )
+    with open(os.path.join(config_dir, "configuration.yaml"), "w") as file:
+        file.write("homeassistant:\n  time_zone: UTC\nlogger:\n  default: critical\n")
+    hass = await bootstrap.async_setup_hass(
+        runner.RuntimeConfig(config_dir=config_dir, skip_pip=True)
+    )
+
+    entries = [
+        ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=f"Location {index}",
+            data={
+                "name": f"Location {index}",
+                "api_key": "benchmark",
+                "latitude": 40 + index / 100,
+                "longitude": 10 + index / 100,
+                "max_daily_requests": 1_000_000,
+            },
+            source="user",
+            unique_id=f"benchmark-{index}",
+        )
+        for index in range(count)
+    ]
+
+    if trace_memory:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    start = time.perf_counter()
+    for entry in entries:
+        await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    result = {
+        "startup": time.perf_counter() - start,
+        "entities": len(hass.states.async_all()),
+    }
+    if trace_memory:
+        result["memory"] = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+    coordinators = [
+        coordinator
+        for entry in entries
+        for coordinator in hass.data[DOMAIN][entry.entry_id]
+    ]
+    dispatch = [0.0]
+    for coordinator in coordinators:
+        _time_dispatch(coordinator, dispatch)
+    for _ in range(updates):
+        for coordinator in coordinators:
+            await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    performed = sum(coordinator.writes_performed for coordinator in coordinators)
+    skipped = sum(coordinator.writes_skipped for coordinator in coordinators)
+    result["dispatch_us"] = dispatch[0] * 1e6 / max(updates * result["entities"], 1)
+    result["written"] = performed / max(performed + skipped, 1)
+
+    # Reloading uses the stored snapshots, like a restart within the interval
+    start = time.perf_counter()
+    for entry in entries:
+        await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    result["warm"] = time.perf_counter() - start
+
+    await hass.async_stop()
+    return result
+
+
+def _time_dispatch(coordinator, total: list[float]) -> None:
+    """Add the CPU time spent updating the entities of a coordinator to total."""
+    update_listeners = coordinator.async_update_listeners
+
+    def timed_update_listeners() -> None:
+        start = time.process_time()
+        update_listeners()
+        total[0] += time.process_time() - start
+
+    coordinator.async_update_listeners = timed_update_listeners
+
+
+def _ms(seconds: float) -> float:
+    return seconds * 1000
+
+
+def _p95(values: list[float]) -> float:
+    return statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+
+
+async def main(args: argparse.Namespace) -> None:
+    await bench_fetch(args.requests, args.latency, 0.0)
+    if args.error_rate:
+        await bench_fetch(args.requests, args.latency, args.error_rate)
+    await bench_transport(args.requests, args.latency)
+    await bench_entries(args.entries, args.updates, args.latency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--updates", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    asyncio.run(main(parser.parse_args()))
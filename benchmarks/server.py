@@ -0,0 +1,161 @@
+"""Local stand-in for the One Call and Air Pollution endpoints.
+
+Serves synthetic payloads of a chosen profile, honours the ``exclude``
+parameter, compresses responses like the real endpoint when asked to and can
+inject latency and errors, on every endpoint alike. Run it on its own with
+
+    python -m benchmarks.server --profile full --latency 0.05 --error-rate 0.1
+
+and point a development instance at the printed URL.
+"""
+import argparse
+import asyncio
+import json
+import random
+
+from aiohttp import web
+
+from .payloads import make_air_pollution, make_payload
+
+BLOCKS = ("minutely", "hourly", "daily", "alerts")
+
+# Payload profiles, from a lean current/daily document to a storm with
+# several long alerts.
+PROFILES = {
+    "lean": {"minutely": False, "hourly": False, "alerts": 0},
+    "full": {"alerts": 1},
+    "storm": {"alerts": 5},
+}
+
+# Distinct payloads cycled through so consecutive polls of a location differ
+# like real data
+VARIANTS = 4
+
+# Hours in the air pollution forecast, about four days like the real endpoint
+AIR_POLLUTION_FORECAST_HOURS = 96
+
+
+class StandInServer:
+    """aiohttp server answering like the One Call 3.0 and Air Pollution endpoints."""
+
+    def __init__(
+        self,
+        profile: str = "full",
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int | None = None,
+        compress: bool = False,
+    ):
+        self.profile = profile
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.compress = compress
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self._rng = random.Random(seed)
+        self._bodies: dict[tuple[str, int], bytes] = {}
+        self._polls: dict[tuple[str, str], int] = {}
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the endpoint URL."""
+        app = web.Application()
+        app.router.add_get("/data/3.0/onecall", self._handle)
+        app.router.add_get("/data/2.5/air_pollution", self._handle_air_pollution)
+        app.router.add_get("/data/2.5/air_pollution/forecast", self._handle_air_pollution)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}/data/3.0/onecall"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def body(self, exclude: str = "", variant: int = 0) -> bytes:
+        """Return the encoded payload for an exclude list, cached per variant."""
+        key = (exclude, variant)
+        if key not in self._bodies:
+            excluded = set(filter(None, exclude.split(",")))
+            options = dict(PROFILES[self.profile])
+            for block in BLOCKS:
+                if block in excluded:
+                    options[block] = 0 if block == "alerts" else False
+            payload = make_payload(seed=variant, **options)
+            if "current" in excluded:
+                payload.pop("current")
+            self._bodies[key] = json.dumps(payload).encode()
+        return self._bodies[key]
+
+    def air_pollution_body(self, forecast: bool) -> bytes:
+        """Return the encoded current air pollution or its forecast, cached."""
+        key = ("air_pollution_forecast" if forecast else "air_pollution", 0)
+        if key not in self._bodies:
+            hours = AIR_POLLUTION_FORECAST_HOURS if forecast else 1
+            self._bodies[key] = json.dumps(make_air_pollution(hours=hours)).encode()
+        return self._bodies[key]
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate_network()) is not None:
+            return error
+        # Each location steps through the variants with every poll
+        location = (request.query.get("lat", ""), request.query.get("lon", ""))
+        poll = self._polls[location] = self._polls.get(location, -1) + 1
+        return self._respond(self.body(request.query.get("exclude", ""), poll % VARIANTS))
+
+    async def _handle_air_pollution(self, request: web.Request) -> web.Response:
+        if (error := await self._simulate_network()) is not None:
+            return error
+        return self._respond(self.air_pollution_body(request.path.endswith("/forecast")))
+
+    async def _simulate_network(self) -> web.Response | None:
+        """Count the request, wait the latency and return an injected error, if any."""
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        roll = self._rng.random()
+        if roll < self.error_rate:
+            self.errors += 1
+            return web.Response(status=503)
+        if roll < self.error_rate + self.rate_limit_rate:
+            self.errors += 1
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        return None
+
+    def _respond(self, body: bytes) -> web.Response:
+        self.bytes_sent += len(body)
+        response = web.Response(body=body, content_type="application/json")
+        if self.compress:
+            # Negotiated with the Accept-Encoding header of the request
+            response.enable_compression()
+        return response
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = StandInServer(
+        args.profile,
+        args.latency,
+        args.error_rate,
+        args.rate_limit_rate,
+        compress=args.compress,
+    )
+    print(await server.start(port=args.port), flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profile", choices=PROFILES, default="full")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--port", type=int, default=8099)
+    asyncio.run(_serve(parser.parse_args()))
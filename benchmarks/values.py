@@ -0,0 +1,100 @@
+"""Micro-benchmark of per-update sensor value extraction.
+
+Compares walking the payload on every state read, as the sensors used to,
+with compiling each SENSOR_TYPES entry once and extracting all values into
+a snapshot per update.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.values
+"""
+from datetime import datetime, timezone
+import timeit
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.openweather_one_call.sensor import SENSOR_TYPES, _compile_value
+from custom_components.openweather_one_call.snapshot import OneCallSnapshot
+
+from .payloads import make_payload
+
+DAILY_KEYS = [
+    "temp.day", "temp.min", "temp.max", "temp.night", "temp.eve", "temp.morn", "pop",
+    "sunrise", "sunset", "sunrise_time", "sunset_time",
+]
+
+
+def _entities():
+    """Return (sensor_type, base_key, forecast_day, config) like the sensor platform."""
+    entities = [
+        (key, key, None, config) for key, config in SENSOR_TYPES.items() if key.startswith("current.")
+    ]
+    for day in range(2):
+        for base_key in DAILY_KEYS:
+            entities.append(
+                (f"daily_{day}_{base_key.replace('.', '_')}", base_key, day, SENSOR_TYPES[base_key])
+            )
+    return entities
+
+
+def _legacy_value(data, sensor_type, base_key, forecast_day, config):
+    """The lookup previously done by every native_value read."""
+    source_key = base_key.removesuffix("_time") if forecast_day is not None else None
+    lookup_key = source_key or sensor_type
+    if forecast_day is not None:
+        if "daily" not in data or len(data["daily"]) <= forecast_day:
+            return None
+        data = data["daily"][forecast_day]
+    value = data
+    for key in lookup_key.split("."):
+        if isinstance(value, dict):
+            value = value.get(key)
+        elif isinstance(value, list) and key.isdigit() and len(value) > int(key):
+            value = value[int(key)]
+        else:
+            value = None
+            break
+    if sensor_type.endswith(("_sunrise_time", "_sunset_time")):
+        if value is not None:
+            return dt_util.as_local(datetime.fromtimestamp(value, tz=timezone.utc)).strftime("%H:%M")
+        return None
+    if source_key == "pop" and value is not None:
+        return value * 100
+    if config["device_class"] == "timestamp" and value is not None:
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    return value
+
+
+def main(reads_per_update: int = 2, number: int = 2000) -> None:
+    payload = make_payload()
+    entities = _entities()
+    value_fns = {
+        sensor_type: _compile_value(base_key, config, forecast_day)
+        for sensor_type, base_key, forecast_day, config in entities
+    }
+
+    values = OneCallSnapshot(payload, value_fns).values
+    for entity in entities:
+        assert values[entity[0]] == _legacy_value(payload, *entity), entity[0]
+
+    def legacy():
+        # HA reads native_value at least once per state write
+        for _ in range(reads_per_update):
+            for entity in entities:
+                _legacy_value(payload, *entity)
+
+    def compiled():
+        values = OneCallSnapshot(payload, value_fns).values
+        for _ in range(reads_per_update):
+            for sensor_type, *_ in entities:
+                values[sensor_type]
+
+    legacy_us = min(timeit.repeat(legacy, number=number, repeat=5)) / number * 1e6
+    compiled_us = min(timeit.repeat(compiled, number=number, repeat=5)) / number * 1e6
+    print(f"{len(entities)} sensors, {reads_per_update} state reads per update")
+    print(f"legacy lookups:   {legacy_us:8.1f} us/update")
+    print(f"compiled values:  {compiled_us:8.1f} us/update ({legacy_us / compiled_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
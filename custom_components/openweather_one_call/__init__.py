@@ -1,77 +1,294 @@
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.exceptions import ConfigEntryNotReady
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
+from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
     CONF_API_KEY,
+    CONF_DAILY_HORIZON,
+    CONF_DEDICATED_TRANSPORT,
+    CONF_FORECAST_FALLBACK,
+    CONF_HOURLY_HORIZON,
     CONF_LATITUDE,
+    CONF_LOCATIONS,
     CONF_LONGITUDE,
     CONF_MAX_DAILY_REQUESTS,
+    CONF_NAME,
+    CONF_PRIORITY,
+    BACKFILL_DAILY,
+    BACKFILL_HOURLY,
+    BACKFILL_STORAGE_VERSION,
+    DATA_BACKFILLS,
+    DATA_HORIZONS,
+    DATA_VALIDATION_PAYLOADS,
+    DEFAULT_BLOCKS,
+    DEFAULT_DAILY_HORIZON,
+    DEFAULT_DEDICATED_TRANSPORT,
+    DEFAULT_FORECAST_FALLBACK,
+    DEFAULT_HOURLY_HORIZON,
     DEFAULT_MAX_DAILY_REQUESTS,
+    DEFAULT_PRIORITY,
+    DEFAULT_UPDATE_INTERVAL,
+    MIN_UPDATE_INTERVAL,
     PLATFORMS,
+    SERVICE_BACKFILL,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .backfill import StatisticsBackfill, backfill_store_key
+from .budget import async_get_budget
+from .coordinator import OpenWeatherOneCallCoordinator
+from .grid import async_get_grid_cell
+from .transport import async_get_session
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required("config_entry_id"): cv.string,
+        vol.Required("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("resolution", default=BACKFILL_HOURLY): vol.In(
+            [BACKFILL_HOURLY, BACKFILL_DAILY]
+        ),
+        vol.Optional("max_requests"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
 )
-from .coordinator import OpenWeatherOneCallApi, OpenWeatherOneCallCoordinator
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the services of the integration."""
+
+    async def async_backfill(call: ServiceCall) -> None:
+        """Backfill the statistics of every location of a config entry."""
+        entry = hass.config_entries.async_get_entry(call.data["config_entry_id"])
+        if entry is None or entry.domain != DOMAIN:
+            raise HomeAssistantError("Unknown OpenWeatherMap One Call config entry")
+        if entry.state is not ConfigEntryState.LOADED:
+            raise HomeAssistantError(f"{entry.title} is not loaded")
+        if "recorder" not in hass.config.components:
+            raise HomeAssistantError("Backfilling statistics needs the recorder")
+        # The recorder compiles the statistics of the last hour itself
+        latest = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+            hours=1
+        )
+        start = dt_util.as_utc(call.data["start"])
+        end = min(dt_util.as_utc(call.data.get("end", latest)), latest)
+        if start >= end:
+            raise HomeAssistantError("The backfill period must start before it ends")
+        for backfill in hass.data[DATA_BACKFILLS][entry.entry_id]:
+            await backfill.async_start(
+                start, end, call.data["resolution"], call.data.get("max_requests")
+            )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, async_backfill, schema=BACKFILL_SCHEMA
+    )
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up OpenWeatherMap One Call from a config entry."""
-    session = async_get_clientsession(hass)
-    api = OpenWeatherOneCallApi(
-        session,
-        entry.data[CONF_API_KEY],
-        entry.data[CONF_LATITUDE],
-        entry.data[CONF_LONGITUDE],
-    )
+    budget = await async_get_budget(hass, entry.data[CONF_API_KEY])
 
-    update_interval_seconds = _calculate_update_interval(
-        entry.options.get(
-            CONF_MAX_DAILY_REQUESTS, entry.data.get(CONF_MAX_DAILY_REQUESTS, DEFAULT_MAX_DAILY_REQUESTS)
-        )
+    max_daily_requests, priority, forecast_fallback, dedicated_transport = _entry_options(
+        entry
     )
+    session = async_get_session(hass, dedicated_transport)
+    update_interval_seconds = _calculate_update_interval(max_daily_requests)
     update_interval = timedelta(seconds=update_interval_seconds)
+    validated = hass.data.get(DATA_VALIDATION_PAYLOADS, {})
 
-    coordinator = OpenWeatherOneCallCoordinator(hass, api, update_interval)
-
-    await coordinator.async_config_entry_first_refresh()
+    coordinators = []
+    first_refreshes = []
+    for location_id, name, latitude, longitude in _entry_locations(entry):
+        cell, release_cell = async_get_grid_cell(
+            hass, entry.data[CONF_API_KEY], latitude, longitude, budget, session
+        )
+        entry.async_on_unload(release_cell)
+        store = Store(hass, SNAPSHOT_STORAGE_VERSION, _snapshot_store_key(location_id))
+        coordinator = OpenWeatherOneCallCoordinator(
+            hass, cell.api, update_interval, store, location_id, name
+        )
+        entry.async_on_unload(
+            budget.async_register(coordinator, max_daily_requests, priority)
+        )
+        coordinator.async_set_forecast_fallback(forecast_fallback)
+        coordinators.append(coordinator)
+        first_refreshes.append(
+            _async_first_refresh(
+                coordinator,
+                cell.phase,
+                validated.pop((entry.data[CONF_API_KEY], latitude, longitude), None),
+            )
+        )
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    results = await asyncio.gather(*first_refreshes, return_exceptions=True)
+    for result in results:
+        if isinstance(result, ConfigEntryAuthFailed):
+            raise result
+    # Locations that failed start unavailable, unless all of them failed
+    if all(isinstance(result, Exception) for result in results):
+        raise ConfigEntryNotReady from results[0]
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = coordinators
+    hass.data.setdefault(DATA_HORIZONS, {})[entry.entry_id] = _entry_horizon(entry)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
+    # Backfills interrupted by a restart continue once the entities exist
+    backfills = [
+        StatisticsBackfill(hass, entry, coordinator) for coordinator in coordinators
+    ]
+    hass.data.setdefault(DATA_BACKFILLS, {})[entry.entry_id] = backfills
+    for backfill in backfills:
+        entry.async_on_unload(backfill.async_cancel)
+
+    async def async_resume_backfills(_: HomeAssistant) -> None:
+        for backfill in backfills:
+            await backfill.async_resume()
+
+    entry.async_on_unload(async_at_started(hass, async_resume_backfills))
+
     return True
 
 
+async def _async_first_refresh(
+    coordinator: OpenWeatherOneCallCoordinator,
+    phase: float,
+    validated: tuple[dict, datetime] | None,
+) -> None:
+    # The payload fetched while validating a new entry, or a recent enough
+    # snapshot from the last run, makes the first request unnecessary
+    if validated is not None:
+        data, fetched = validated
+        if coordinator.async_adopt(data, fetched, DEFAULT_BLOCKS):
+            coordinator.async_save_snapshot()
+            return
+    if await coordinator.async_restore():
+        return
+    await coordinator.async_config_entry_first_refresh()
+    coordinator.async_stagger(phase)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DATA_BACKFILLS].pop(entry.entry_id)
+        hass.data[DATA_HORIZONS].pop(entry.entry_id)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored snapshots and backfill checkpoints of a deleted config entry."""
+    for location_id, *_ in _entry_locations(entry):
+        await Store(
+            hass, SNAPSHOT_STORAGE_VERSION, _snapshot_store_key(location_id)
+        ).async_remove()
+        await Store(
+            hass, BACKFILL_STORAGE_VERSION, backfill_store_key(location_id)
+        ).async_remove()
+
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options to the running coordinators, without a reload.
+
+    Only a changed forecast horizon, which adds or removes sensors, reloads
+    the entry.
+    """
+    if _entry_horizon(entry) != hass.data[DATA_HORIZONS][entry.entry_id]:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    budget = await async_get_budget(hass, entry.data[CONF_API_KEY])
+    max_daily_requests, priority, forecast_fallback, dedicated_transport = _entry_options(
+        entry
+    )
+    session = async_get_session(hass, dedicated_transport)
+    for coordinator in hass.data[DOMAIN][entry.entry_id]:
+        budget.async_update(coordinator, max_daily_requests, priority)
+        coordinator.async_set_forecast_fallback(forecast_fallback)
+        coordinator.api.async_set_session(session)
+        coordinator.async_reschedule()
+
+
+def _entry_options(entry: ConfigEntry) -> tuple[int, int, bool, bool]:
+    """Return the daily request limit, priority, fallback and transport of an entry."""
+    max_daily_requests = entry.options.get(
+        CONF_MAX_DAILY_REQUESTS, entry.data.get(CONF_MAX_DAILY_REQUESTS, DEFAULT_MAX_DAILY_REQUESTS)
+    )
+    return (
+        max_daily_requests,
+        entry.options.get(CONF_PRIORITY, DEFAULT_PRIORITY),
+        entry.options.get(CONF_FORECAST_FALLBACK, DEFAULT_FORECAST_FALLBACK),
+        entry.options.get(CONF_DEDICATED_TRANSPORT, DEFAULT_DEDICATED_TRANSPORT),
+    )
+
+
+def _entry_horizon(entry: ConfigEntry) -> tuple[int, int]:
+    """Return the days of daily and hours of hourly forecast sensors of an entry."""
+    return (
+        entry.options.get(CONF_DAILY_HORIZON, DEFAULT_DAILY_HORIZON),
+        entry.options.get(CONF_HOURLY_HORIZON, DEFAULT_HOURLY_HORIZON),
+    )
 
 
 def _calculate_update_interval(max_daily_requests: int) -> int:
     """Calculate the update interval in seconds."""
     if max_daily_requests <= 0:
         # Default to a safe interval if the value is invalid
-        return 15 * 60
+        return DEFAULT_UPDATE_INTERVAL
 
     # Ensure we don't exceed 4 requests per hour (15 minute interval)
     # and we respect the 10 minute minimum from the API provider
-    interval = max((24 * 3600) / max_daily_requests, 10 * 60)
+    interval = max((24 * 3600) / max_daily_requests, MIN_UPDATE_INTERVAL)
     return int(interval)
+
+
+def _entry_locations(entry: ConfigEntry) -> list[tuple[str, str, float, float]]:
+    """Return the id, name and coordinates of the locations of an entry.
+
+    A single location uses the entry id, which keeps the ids of its devices
+    and entities. Locations of a batch entry add their coordinates.
+    """
+    if CONF_LOCATIONS not in entry.data:
+        return [
+            (
+                entry.entry_id,
+                entry.data[CONF_NAME],
+                entry.data[CONF_LATITUDE],
+                entry.data[CONF_LONGITUDE],
+            )
+        ]
+    return [
+        (
+            f"{entry.entry_id}_{location[CONF_LATITUDE]}_{location[CONF_LONGITUDE]}",
+            location[CONF_NAME],
+            location[CONF_LATITUDE],
+            location[CONF_LONGITUDE],
+        )
+        for location in entry.data[CONF_LOCATIONS]
+    ]
+
+
+def _snapshot_store_key(location_id: str) -> str:
+    """Return the storage key of the last fetched payload of a location."""
+    return f"{DOMAIN}.{location_id}"
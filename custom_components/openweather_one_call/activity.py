@@ -0,0 +1,66 @@
+"""Weather activity of a One Call payload, which sets the polling pace."""
+from .const import (
+    ACTIVITY_ACTIVE,
+    ACTIVITY_CALM,
+    ACTIVITY_CALM_GUST,
+    ACTIVITY_CALM_POP,
+    ACTIVITY_GUST_THRESHOLD,
+    ACTIVITY_LOOKAHEAD_HOURS,
+    ACTIVITY_NORMAL,
+    ACTIVITY_POP_RISE,
+    NOWCAST_RAIN_THRESHOLD,
+)
+from .snapshot import OneCallSnapshot
+
+
+def weather_activity(snapshot: OneCallSnapshot) -> tuple[str, tuple[str, ...]]:
+    """Return how eventful the weather is, with the reasons when it is active.
+
+    The weather is active with alerts, with gusts at or above
+    ACTIVITY_GUST_THRESHOLD now or within the lookahead, with precipitation
+    rising over the minutely block or with the probability of precipitation
+    rising over the hourly block. It is calm without precipitation now or
+    likely soon and with light wind. Blocks missing from the payload do not
+    count either way.
+    """
+    current = snapshot.current
+    soon = snapshot.hourly[1 : ACTIVITY_LOOKAHEAD_HOURS + 1]
+    gust = max(
+        [
+            current.get("wind_gust") or current.get("wind_speed") or 0,
+            *(hour.get("wind_gust") or hour.get("wind_speed") or 0 for hour in soon),
+        ]
+    )
+    intensities = [
+        minute.get("precipitation") or 0 for minute in snapshot.data.get("minutely") or []
+    ]
+    half = len(intensities) // 2
+    pops = [hour.get("pop") or 0 for hour in snapshot.hourly[: ACTIVITY_LOOKAHEAD_HOURS + 1]]
+    if not pops and snapshot.daily:
+        pops = [snapshot.daily[0].get("pop") or 0]
+
+    reasons = []
+    if snapshot.data.get("alerts"):
+        reasons.append("alerts")
+    if gust >= ACTIVITY_GUST_THRESHOLD:
+        reasons.append("wind_gust")
+    if half and (
+        sum(intensities[half:]) / (len(intensities) - half)
+        - sum(intensities[:half]) / half
+        >= NOWCAST_RAIN_THRESHOLD
+    ):
+        reasons.append("precipitation_rising")
+    if len(pops) > 1 and max(pops[1:]) - pops[0] >= ACTIVITY_POP_RISE:
+        reasons.append("pop_rising")
+    if reasons:
+        return ACTIVITY_ACTIVE, tuple(reasons)
+
+    if (
+        gust < ACTIVITY_CALM_GUST
+        and max(pops, default=0) < ACTIVITY_CALM_POP
+        and max(intensities, default=0) < NOWCAST_RAIN_THRESHOLD
+        and "rain" not in current
+        and "snow" not in current
+    ):
+        return ACTIVITY_CALM, ()
+    return ACTIVITY_NORMAL, ()
@@ -0,0 +1,33 @@
+"""Aggregates over the air pollution forecast."""
+from typing import Any
+
+from .const import AIR_POLLUTION_FORECAST_HOURS, BLOCK_AIR_POLLUTION_FORECAST
+from .snapshot import OneCallSnapshot
+
+# Value keys with the component of each forecast hour they take the maximum of
+AIR_POLLUTION_FORECAST_KEYS = {
+    "air_quality_index_max_next_24h": "aqi",
+    "pm2_5_max_next_24h": "pm2_5",
+    "pm10_max_next_24h": "pm10",
+    "o3_max_next_24h": "o3",
+}
+
+
+def compute_air_pollution_forecast(snapshot: OneCallSnapshot) -> dict[str, Any]:
+    """Compute the maximum of every forecast value in one pass over the hours.
+
+    The coordinator drops the hours that are over from the forecast it
+    keeps between requests. Values without forecast hours are None.
+    """
+    maxima: dict[str, Any] = dict.fromkeys(AIR_POLLUTION_FORECAST_KEYS.values())
+    hours = 0
+    for hour in snapshot.data.get(BLOCK_AIR_POLLUTION_FORECAST) or []:
+        values = {"aqi": (hour.get("main") or {}).get("aqi"), **(hour.get("components") or {})}
+        for component, maximum in maxima.items():
+            value = values.get(component)
+            if value is not None and (maximum is None or value > maximum):
+                maxima[component] = value
+        hours += 1
+        if hours == AIR_POLLUTION_FORECAST_HOURS:
+            break
+    return {key: maxima[component] for key, component in AIR_POLLUTION_FORECAST_KEYS.items()}
@@ -0,0 +1,35 @@
+"""Index of the active weather alerts of a One Call payload."""
+import hashlib
+from typing import Any
+
+from .snapshot import OneCallSnapshot
+
+
+def alert_id(alert: dict[str, Any]) -> str:
+    """Return a stable id for an alert from its sender, event and start.
+
+    The same alert keeps its id across payloads, even when its end or
+    description is updated.
+    """
+    key = f"{alert.get('sender_name')}|{alert.get('event')}|{alert.get('start')}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def alert_index(snapshot: OneCallSnapshot) -> dict[str, dict[str, Any]]:
+    """Return the alerts of a snapshot by id, built once per snapshot."""
+    return snapshot.cached("alerts", _build_index)
+
+
+def alert_summary(key: str, alert: dict[str, Any]) -> dict[str, Any]:
+    """Return an alert without its description, which can be kilobytes long."""
+    return {
+        "id": key,
+        "event": alert.get("event"),
+        "sender_name": alert.get("sender_name"),
+        "start": alert.get("start"),
+        "end": alert.get("end"),
+    }
+
+
+def _build_index(snapshot: OneCallSnapshot) -> dict[str, dict[str, Any]]:
+    return {alert_id(alert): alert for alert in snapshot.data.get("alerts") or []}
@@ -0,0 +1,405 @@
+"""Backfill of the long-term statistics of a location from the history endpoints."""
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import date, datetime, time, timedelta, timezone
+import logging
+from typing import Any, NamedTuple
+
+import aiohttp
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    statistics_during_period,
+)
+from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
+    UNIT_CONVERTERS,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    BACKFILL_CHUNK_SIZE,
+    BACKFILL_CONCURRENCY,
+    BACKFILL_DAILY,
+    BACKFILL_STORAGE_VERSION,
+)
+from .coordinator import ApiError, OpenWeatherOneCallCoordinator
+from .sensor import SENSOR_TYPES
+from .snapshot import compile_path
+
+_LOGGER = logging.getLogger(__name__)
+
+_HOUR = timedelta(hours=1)
+
+# Values of a day summary by local hour, see
+# https://openweathermap.org/api/one-call-3#history_daily_aggregation
+DAY_SUMMARY_VALUES = {
+    0: {"current.temp": "temperature.night"},
+    6: {"current.temp": "temperature.morning"},
+    12: {
+        "current.temp": "temperature.afternoon",
+        "current.pressure": "pressure.afternoon",
+        "current.humidity": "humidity.afternoon",
+        "current.clouds": "cloud_cover.afternoon",
+    },
+    18: {"current.temp": "temperature.evening"},
+}
+
+
+class _Sensor(NamedTuple):
+    """A sensor whose statistics are backfilled."""
+
+    key: str
+    entity_id: str
+    unit: str | None
+    convert: Callable[[float], float]
+
+
+class StatisticsBackfill:
+    """Fill gaps in the hourly statistics of the sensors of one location.
+
+    Hours without statistics are fetched from the timemachine endpoint, one
+    request per hour, or coarsely from the day_summary endpoint, one request
+    per day for the temperatures at 00, 06, 12 and 18 local time and the
+    afternoon pressure, humidity and cloudiness. Progress is saved after
+    every chunk, so a backfill stopped by a restart or a spent budget
+    continues where it left off.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        coordinator: OpenWeatherOneCallCoordinator,
+    ):
+        self.hass = hass
+        self.entry = entry
+        self.coordinator = coordinator
+        self._store = Store(
+            hass, BACKFILL_STORAGE_VERSION, backfill_store_key(coordinator.location_id)
+        )
+        self._task: asyncio.Task | None = None
+        self._unsub_midnight: Callable[[], None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while a backfill is fetching or importing."""
+        return self._task is not None and not self._task.done()
+
+    async def async_start(
+        self,
+        start: datetime,
+        end: datetime,
+        resolution: str,
+        max_requests: int | None = None,
+    ) -> None:
+        """Start backfilling a period, replacing an unfinished one."""
+        if self.running:
+            raise HomeAssistantError(
+                f"A backfill of {self.coordinator.location_name} is already running"
+            )
+        checkpoint = {
+            "start": start.timestamp(),
+            "end": end.timestamp(),
+            "resolution": resolution,
+            "max_requests": max_requests,
+            "requests": 0,
+            "done": [],
+        }
+        await self._store.async_save(checkpoint)
+        self._async_spawn(checkpoint)
+
+    async def async_resume(self) -> None:
+        """Continue an unfinished backfill from its checkpoint."""
+        if self.running or (checkpoint := await self._store.async_load()) is None:
+            return
+        self._async_spawn(checkpoint)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop waiting for the budget to reset, the task ends with the entry."""
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    @callback
+    def _async_spawn(self, checkpoint: dict[str, Any]) -> None:
+        self.async_cancel()
+        self._task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_run(checkpoint),
+            f"{DOMAIN} backfill {self.coordinator.location_name}",
+        )
+
+    async def _async_run(self, checkpoint: dict[str, Any]) -> None:
+        name = self.coordinator.location_name
+        if not (sensors := self._sensors()):
+            _LOGGER.warning("No enabled sensors of %s to backfill", name)
+            await self._store.async_remove()
+            return
+
+        start = dt_util.utc_from_timestamp(checkpoint["start"])
+        end = dt_util.utc_from_timestamp(checkpoint["end"])
+        daily = checkpoint["resolution"] == BACKFILL_DAILY
+        missing = await self._async_missing_hours(sensors, start, end)
+        done = set(checkpoint["done"])
+        if daily:
+            offset = timedelta(
+                seconds=(self.coordinator.data or {}).get("timezone_offset", 0)
+            )
+            units = [
+                day
+                for day, noon in _days(start, end, offset)
+                if noon in missing and day.isoformat() not in done
+            ]
+        else:
+            units = [
+                hour
+                for hour in _hours(start, end)
+                if hour in missing and str(int(hour.timestamp())) not in done
+            ]
+
+        allowance = self._allowance(checkpoint)
+        pending, left_out = units[:allowance], units[allowance:]
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+        api = self.coordinator.api
+
+        async def fetch(unit):
+            async with semaphore:
+                if daily:
+                    return await api.fetch_day_summary(unit)
+                return await api.fetch_timemachine(int(unit.timestamp()))
+
+        imported = 0
+        while pending:
+            chunk = pending[:BACKFILL_CHUNK_SIZE]
+            # Reserved a chunk at a time, so backfills running together take
+            # turns at the share of the budget
+            if api.budget is not None:
+                chunk = chunk[: api.budget.async_reserve_backfill(len(chunk))]
+            if not chunk:
+                _LOGGER.info(
+                    "Backfill of %s paused after %s hours to leave requests for "
+                    "polling, it continues after the daily budget resets",
+                    name,
+                    imported,
+                )
+                self._unsub_midnight = async_track_utc_time_change(
+                    self.hass, self._async_midnight, hour=0, minute=5, second=0
+                )
+                return
+            pending = pending[len(chunk) :]
+            results = await asyncio.gather(
+                *(fetch(unit) for unit in chunk), return_exceptions=True
+            )
+            rows: dict[str, list[tuple[datetime, Any]]] = defaultdict(list)
+            error = None
+            for unit, result in zip(chunk, results):
+                checkpoint["requests"] += 1
+                if isinstance(result, (ApiError, aiohttp.ClientError, asyncio.TimeoutError)):
+                    error = error or result
+                    continue
+                if isinstance(result, BaseException):
+                    raise result
+                if daily:
+                    done.add(unit.isoformat())
+                    values = _day_summary_values(unit, result)
+                else:
+                    done.add(str(int(unit.timestamp())))
+                    values = _timemachine_values(unit, result)
+                for key, hour, value in values:
+                    rows[key].append((hour, value))
+            imported += self._import(sensors, rows, missing)
+            checkpoint["done"] = sorted(done)
+            await self._store.async_save(checkpoint)
+            if error is not None:
+                _LOGGER.warning(
+                    "Backfill of %s stopped after %s hours, it continues after "
+                    "a restart or when called again: %s",
+                    name,
+                    imported,
+                    error,
+                )
+                return
+
+        _LOGGER.info(
+            "Backfill of %s finished with %s hours imported, %s left out",
+            name,
+            imported,
+            len(left_out),
+        )
+        await self._store.async_remove()
+
+    @callback
+    def _async_midnight(self, now: datetime) -> None:
+        self.async_cancel()
+        self.hass.async_create_task(self.async_resume())
+
+    def _allowance(self, checkpoint: dict[str, Any]) -> int | None:
+        """Return how many requests max_requests leaves, None without a limit.
+
+        The share of the daily budget is reserved from the budget as the
+        requests are made.
+        """
+        if checkpoint["max_requests"] is None:
+            return None
+        return max(checkpoint["max_requests"] - checkpoint["requests"], 0)
+
+    def _sensors(self) -> list[_Sensor]:
+        """Return the enabled current condition sensors with a mean to backfill."""
+        registry = er.async_get(self.hass)
+        sensors = []
+        for key, config in SENSOR_TYPES.items():
+            if (
+                not key.startswith("current.")
+                or config.get("state_class") != SensorStateClass.MEASUREMENT
+            ):
+                continue
+            entity_id = registry.async_get_entity_id(
+                SENSOR_DOMAIN, DOMAIN, f"{self.coordinator.location_id}_{key}"
+            )
+            if entity_id is None or (state := self.hass.states.get(entity_id)) is None:
+                continue
+            # Sensors may show a converted unit, statistics are kept in it
+            unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            if unit == config.get("unit"):
+                convert = float
+            elif (converter := UNIT_CONVERTERS.get(config.get("device_class"))) and {
+                unit,
+                config.get("unit"),
+            } <= converter.VALID_UNITS:
+                convert = converter.converter_factory(config.get("unit"), unit)
+            else:
+                continue
+            sensors.append(_Sensor(key, entity_id, unit, convert))
+        return sensors
+
+    async def _async_missing_hours(
+        self, sensors: list[_Sensor], start: datetime, end: datetime
+    ) -> set[datetime]:
+        """Return the hours of a period without statistics for any of the sensors.
+
+        Hours that only some sensors lack are left alone, the history may
+        simply not have those values.
+        """
+        existing = await get_instance(self.hass).async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            start,
+            end,
+            {sensor.entity_id for sensor in sensors},
+            "hour",
+            None,
+            {"mean"},
+        )
+        present = {
+            dt_util.utc_from_timestamp(row["start"])
+            for rows in existing.values()
+            for row in rows
+        }
+        return set(_hours(start, end)) - present
+
+    def _import(
+        self,
+        sensors: list[_Sensor],
+        rows: dict[str, list[tuple[datetime, Any]]],
+        missing: set[datetime],
+    ) -> int:
+        """Queue the fetched values for import and return the hours imported."""
+        hours = set()
+        for sensor in sensors:
+            statistics = []
+            for hour, value in rows.get(sensor.key, ()):
+                if value is None or hour not in missing:
+                    continue
+                value = sensor.convert(value)
+                statistics.append(StatisticData(start=hour, mean=value, min=value, max=value))
+                hours.add(hour)
+            if statistics:
+                async_import_statistics(
+                    self.hass,
+                    StatisticMetaData(
+                        has_mean=True,
+                        has_sum=False,
+                        name=None,
+                        source="recorder",
+                        statistic_id=sensor.entity_id,
+                        unit_of_measurement=sensor.unit,
+                    ),
+                    statistics,
+                )
+        return len(hours)
+
+
+def backfill_store_key(location_id: str) -> str:
+    """Return the storage key of the backfill checkpoint of a location."""
+    return f"{DOMAIN}.backfill.{location_id}"
+
+
+def _hours(start: datetime, end: datetime) -> Iterable[datetime]:
+    """Return the whole hours starting in [start, end)."""
+    hour = start.replace(minute=0, second=0, microsecond=0)
+    if hour < start:
+        hour += _HOUR
+    while hour < end:
+        yield hour
+        hour += _HOUR
+
+
+def _days(
+    start: datetime, end: datetime, offset: timedelta
+) -> Iterable[tuple[date, datetime]]:
+    """Return the local days whose noon is in [start, end), with that noon hour."""
+    day = (start + offset).date()
+    while (noon := _local_hour(day, 12, offset)) < end:
+        if noon >= start:
+            yield day, noon
+        day += timedelta(days=1)
+
+
+def _local_hour(day: date, hour: int, offset: timedelta) -> datetime:
+    """Return the UTC hour holding a local hour of a day."""
+    local = datetime.combine(day, time(hour), timezone(offset))
+    return local.astimezone(dt_util.UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _timemachine_values(
+    hour: datetime, data: dict[str, Any]
+) -> Iterable[tuple[str, datetime, Any]]:
+    if not (items := data.get("data")):
+        return
+    for key in SENSOR_TYPES:
+        if key.startswith("current."):
+            yield key, hour, compile_path(key.removeprefix("current."))(items[0])
+
+
+def _day_summary_values(
+    day: date, data: dict[str, Any]
+) -> Iterable[tuple[str, datetime, Any]]:
+    offset = _parse_tz(data.get("tz"))
+    for local_hour, paths in DAY_SUMMARY_VALUES.items():
+        hour = _local_hour(day, local_hour, offset)
+        for key, path in paths.items():
+            yield key, hour, compile_path(path)(data)
+
+
+def _parse_tz(value: str | None) -> timedelta:
+    """Parse a day summary time zone such as +02:00."""
+    try:
+        hours, minutes = value.split(":")
+        sign = -1 if hours.startswith("-") else 1
+        return sign * timedelta(hours=abs(int(hours)), minutes=int(minutes))
+    except (AttributeError, ValueError):
+        return timedelta(0)
@@ -3,11 +3,12 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_NAME
+from .alerts import alert_index
+from .const import DOMAIN, BLOCK_ALERTS
+from .entity import OpenWeatherOneCallEntity
 
 
 async def async_setup_entry(
@@ -16,67 +17,50 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary sensor platform."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-
     async_add_entities(
-        [
-            OpenWeatherOneCallBinarySensor(
-                coordinator=coordinator,
-                config_entry=entry,
-                sensor_type="alerts_active",
-                device_class=BinarySensorDeviceClass.SAFETY,
-            ),
-        ]
+        OpenWeatherOneCallBinarySensor(
+            coordinator=coordinator,
+            config_entry=entry,
+            sensor_type="alerts_active",
+            device_class=BinarySensorDeviceClass.SAFETY,
+        )
+        for coordinator in hass.data[DOMAIN][entry.entry_id]
     )
 
 
-class OpenWeatherOneCallBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class OpenWeatherOneCallBinarySensor(OpenWeatherOneCallEntity, BinarySensorEntity):
     """Representation of a Binary Sensor."""
 
+    _required_blocks = (BLOCK_ALERTS,)
+    _unrecorded_attributes = frozenset({"description"})
+
     def __init__(self, coordinator, config_entry, sensor_type, device_class):
         """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator)
-        self.config_entry = config_entry
+        super().__init__(coordinator, config_entry, sensor_type, VALUE_FNS[sensor_type])
         self._sensor_type = sensor_type
 
-        self._attr_has_entity_name = True
         self._attr_translation_key = sensor_type
-        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_type}"
+        self._attr_unique_id = f"{self._location_id}_{sensor_type}"
         self._attr_device_class = device_class
 
-    @property
-    def is_on(self) -> bool | None:
-        """Return true if the binary sensor is on."""
-        data = self.coordinator.data
-        if data is None:
-            return None
+    @callback
+    def _async_set_value(self, value) -> None:
+        self._attr_is_on, self._attr_extra_state_attributes = value or (None, None)
 
-        if self._sensor_type == "alerts_active":
-            return bool(data.get("alerts"))
-        return None
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        data = self.coordinator.data
-        if data is None or not data.get("alerts"):
-            return None
+def _alerts_active_value(snapshot):
+    """Return the state and attributes of the alerts_active binary sensor."""
+    if not (alerts := alert_index(snapshot)):
+        return False, None
+    alert = next(iter(alerts.values()))
+    return True, {
+        "sender_name": alert.get("sender_name"),
+        "event": alert.get("event"),
+        "description": alert.get("description"),
+        "count": len(alerts),
+    }
 
-        if self._sensor_type == "alerts_active":
-            alert = data["alerts"][0]
-            return {
-                "sender_name": alert.get("sender_name"),
-                "event": alert.get("event"),
-                "description": alert.get("description"),
-            }
-        return None
 
-    @property
-    def device_info(self):
-        """Link this entity to the device registry."""
-        return {
-            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
-            "name": self.config_entry.data[CONF_NAME],
-            "manufacturer": "Lomion-tm",
-            "model": "One Call API 3.0",
-        }
+VALUE_FNS = {
+    "alerts_active": _alerts_active_value,
+}
@@ -0,0 +1,188 @@
+"""Daily request budget shared by all config entries using the same API key."""
+import asyncio
+from datetime import datetime, timedelta
+import hashlib
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    BACKFILL_BUDGET_SHARE,
+    DATA_BUDGETS,
+    BUDGET_STORAGE_VERSION,
+    BUDGET_SAVE_DELAY,
+    DEFAULT_MAX_DAILY_REQUESTS,
+    MIN_UPDATE_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_get_budget(hass: HomeAssistant, api_key: str) -> "RequestBudget":
+    """Return the loaded request budget for an API key."""
+    budgets = hass.data.setdefault(DATA_BUDGETS, {})
+    if (budget := budgets.get(api_key)) is None:
+        budget = budgets[api_key] = RequestBudget(hass, api_key)
+    await budget.async_load()
+    return budget
+
+
+class RequestBudget:
+    """Count requests per API key and split the remainder across coordinators.
+
+    The OpenWeatherMap subscription limit applies to the API key, not to a
+    location, so every coordinator polling with the same key draws from one
+    daily allowance. The count is persisted and resets at UTC midnight, which
+    is when OpenWeatherMap resets its own counter.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_key: str):
+        self.hass = hass
+        key_id = hashlib.sha256(api_key.encode()).hexdigest()[:12]
+        self._store = Store(hass, BUDGET_STORAGE_VERSION, f"{DOMAIN}.budget.{key_id}")
+        self._load_lock = asyncio.Lock()
+        self._loaded = False
+        self._day = dt_util.utcnow().date()
+        self._count = 0
+        # Requests left to backfills today, set aside by the first one
+        self._backfill_left: int | None = None
+        self._coordinators = {}
+        self._unsub_midnight = None
+
+    async def async_load(self) -> None:
+        """Restore today's request count from storage."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            stored = await self._store.async_load()
+            if stored and stored.get("day") == self._day.isoformat():
+                self._count = stored.get("count", 0)
+                self._backfill_left = stored.get("backfill_left")
+            self._loaded = True
+
+    @property
+    def limit(self) -> int:
+        """Return the daily limit, the strictest one configured for this key."""
+        if not self._coordinators:
+            return DEFAULT_MAX_DAILY_REQUESTS
+        return min(limit for limit, _ in self._coordinators.values())
+
+    @property
+    def used(self) -> int:
+        """Return the number of requests made today."""
+        self._async_rollover()
+        return self._count
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of requests left today."""
+        return max(self.limit - self.used, 0)
+
+    @callback
+    def async_register(self, coordinator, max_daily_requests: int, priority: int):
+        """Add a coordinator to the budget and return a callback to remove it."""
+        self._coordinators[coordinator] = (max_daily_requests, max(priority, 1))
+        if self._unsub_midnight is None:
+            self._unsub_midnight = async_track_utc_time_change(
+                self.hass, self._async_midnight, hour=0, minute=0, second=0
+            )
+        self.async_rebalance()
+
+        @callback
+        def unregister() -> None:
+            self._coordinators.pop(coordinator, None)
+            if not self._coordinators and self._unsub_midnight:
+                self._unsub_midnight()
+                self._unsub_midnight = None
+            self.async_rebalance()
+
+        return unregister
+
+    @callback
+    def async_update(self, coordinator, max_daily_requests: int, priority: int) -> None:
+        """Change the limit or priority of a registered coordinator."""
+        if coordinator in self._coordinators:
+            self._coordinators[coordinator] = (max_daily_requests, max(priority, 1))
+            self.async_rebalance()
+
+    @callback
+    def async_acquire(self) -> bool:
+        """Count a polling request, refusing it once the budget is spent."""
+        if self.remaining <= 0:
+            return False
+        self.async_record()
+        return True
+
+    @callback
+    def async_reserve_backfill(self, requests: int) -> int:
+        """Reserve up to requests for a backfill and return how many were granted.
+
+        The first backfill of the day sets aside BACKFILL_BUDGET_SHARE of the
+        requests left. Backfills of every location using the key draw from
+        that share, so together they leave the rest to polling.
+        """
+        self._async_rollover()
+        if self._backfill_left is None:
+            self._backfill_left = int(self.remaining * BACKFILL_BUDGET_SHARE)
+        granted = max(min(requests, self._backfill_left), 0)
+        self._backfill_left -= granted
+        self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+        return granted
+
+    @callback
+    def async_record(self) -> None:
+        """Count a request that is made regardless of the remaining budget."""
+        self._async_rollover()
+        self._count += 1
+        self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+        self.async_rebalance()
+
+    @callback
+    def async_rebalance(self) -> None:
+        """Spread the remaining requests over the rest of the UTC day by priority."""
+        if not self._coordinators:
+            return
+        now = dt_util.utcnow()
+        seconds_left = (_next_utc_midnight(now) - now).total_seconds()
+        total_priority = sum(priority for _, priority in self._coordinators.values())
+        remaining = self.remaining
+        for coordinator, (_, priority) in self._coordinators.items():
+            share = remaining * priority / total_priority
+            # Without a full request left, wait for the counter to reset
+            interval = seconds_left / share if share >= 1 else seconds_left + 1
+            coordinator.async_set_budget_interval(
+                timedelta(seconds=max(interval, MIN_UPDATE_INTERVAL))
+            )
+
+    @callback
+    def _async_rollover(self) -> None:
+        """Reset the counter if the UTC day changed."""
+        today = dt_util.utcnow().date()
+        if today != self._day:
+            self._day = today
+            self._count = 0
+            self._backfill_left = None
+            self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+
+    @callback
+    def _async_midnight(self, now: datetime) -> None:
+        """Start a new day of requests."""
+        self._async_rollover()
+        self.async_rebalance()
+
+    def _data_to_save(self) -> dict:
+        return {
+            "day": self._day.isoformat(),
+            "count": self._count,
+            "backfill_left": self._backfill_left,
+        }
+
+
+def _next_utc_midnight(now: datetime) -> datetime:
+    return datetime.combine(
+        now.date() + timedelta(days=1), datetime.min.time(), tzinfo=dt_util.UTC
+    )
@@ -1,37 +1,109 @@
+import hashlib
+
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 
 from .const import (
     DOMAIN,
     CONF_API_KEY,
+    CONF_DAILY_HORIZON,
+    CONF_DEDICATED_TRANSPORT,
+    CONF_FORECAST_FALLBACK,
+    CONF_HOURLY_HORIZON,
     CONF_LATITUDE,
+    CONF_LOCATIONS,
     CONF_LONGITUDE,
     CONF_NAME,
     CONF_MAX_DAILY_REQUESTS,
+    CONF_PRIORITY,
+    DATA_VALIDATION_PAYLOADS,
+    DEFAULT_BLOCKS,
+    DEFAULT_DAILY_HORIZON,
+    DEFAULT_DEDICATED_TRANSPORT,
+    DEFAULT_FORECAST_FALLBACK,
+    DEFAULT_HOURLY_HORIZON,
     DEFAULT_MAX_DAILY_REQUESTS,
+    DEFAULT_PRIORITY,
     API_ENDPOINT,
+    MAX_DAILY_HORIZON,
+    MAX_HOURLY_HORIZON,
+    ONECALL_BLOCKS,
 )
+from .budget import async_get_budget
 
 async def validate_input(hass, data):
-    """Validate the user input allows us to connect."""
+    """Validate the user input allows us to connect.
+
+    The blocks polled by default are requested, so the payload can be handed
+    to the first refresh of the new entry instead of fetching it again.
+    """
     session = async_get_clientsession(hass)
     params = {
         "lat": data[CONF_LATITUDE],
         "lon": data[CONF_LONGITUDE],
         "appid": data[CONF_API_KEY],
-        "exclude": "minutely,hourly,daily,alerts",
+        "units": "metric",
+        "exclude": ",".join(sorted(ONECALL_BLOCKS - DEFAULT_BLOCKS)),
     }
+    budget = await async_get_budget(hass, data[CONF_API_KEY])
+    budget.async_record()
     async with session.get(API_ENDPOINT, params=params) as response:
         if response.status == 401:
             raise InvalidAuth
         if response.status != 200:
             raise CannotConnect
+        body = await response.read()
+
+    try:
+        payload = json_loads(body)
+    except JSON_DECODE_EXCEPTIONS as err:
+        raise CannotConnect from err
+
+    return {"title": data[CONF_NAME], "payload": payload, "fetched": dt_util.utcnow()}
+
+
+@callback
+def async_hand_over_payload(hass, data, info) -> None:
+    """Keep the validation payload of a location for the setup of its entry."""
+    key = (data[CONF_API_KEY], data[CONF_LATITUDE], data[CONF_LONGITUDE])
+    hass.data.setdefault(DATA_VALIDATION_PAYLOADS, {})[key] = (
+        info["payload"],
+        info["fetched"],
+    )
+
 
-    return {"title": data[CONF_NAME]}
+def parse_locations(text: str) -> list[dict]:
+    """Parse one "name, latitude, longitude" location per line."""
+    locations = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            name, latitude, longitude = (part.strip() for part in line.rsplit(",", 2))
+            location = {
+                CONF_NAME: name,
+                CONF_LATITUDE: cv.latitude(latitude),
+                CONF_LONGITUDE: cv.longitude(longitude),
+            }
+        except (ValueError, vol.Invalid) as err:
+            raise InvalidLocations from err
+        if not name or any(
+            (other[CONF_LATITUDE], other[CONF_LONGITUDE])
+            == (location[CONF_LATITUDE], location[CONF_LONGITUDE])
+            for other in locations
+        ):
+            raise InvalidLocations
+        locations.append(location)
+    if not locations:
+        raise InvalidLocations
+    return locations
 
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -40,7 +112,11 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
     async def async_step_user(self, user_input=None):
-        """Handle the initial step."""
+        """Let the user choose between a single location and a batch."""
+        return self.async_show_menu(step_id="user", menu_options=["location", "batch"])
+
+    async def async_step_location(self, user_input=None):
+        """Handle a single location."""
         errors = {}
 
         if user_input is not None:
@@ -51,6 +127,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 await self.async_set_unique_id(unique_id)
                 self._abort_if_unique_id_configured()
 
+                async_hand_over_payload(self.hass, user_input, info)
                 return self.async_create_entry(title=info["title"], data=user_input)
 
             except CannotConnect:
@@ -61,7 +138,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
 
         return self.async_show_form(
-            step_id="user",
+            step_id="location",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_NAME): str,
@@ -80,6 +157,62 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_batch(self, user_input=None):
+        """Handle a batch of locations polled by one entry."""
+        errors = {}
+
+        if user_input is not None:
+            try:
+                locations = parse_locations(user_input[CONF_LOCATIONS])
+                data = {
+                    CONF_NAME: user_input[CONF_NAME],
+                    CONF_API_KEY: user_input[CONF_API_KEY],
+                    CONF_MAX_DAILY_REQUESTS: user_input[CONF_MAX_DAILY_REQUESTS],
+                    CONF_LOCATIONS: locations,
+                }
+                # The key and the first location are enough to check the connection
+                first = {**data, **locations[0]}
+                info = await validate_input(self.hass, first)
+
+                coordinates = ";".join(
+                    sorted(
+                        f"{location[CONF_LATITUDE]}-{location[CONF_LONGITUDE]}"
+                        for location in locations
+                    )
+                )
+                unique_id = f"batch-{hashlib.sha256(coordinates.encode()).hexdigest()[:12]}"
+                await self.async_set_unique_id(unique_id)
+                self._abort_if_unique_id_configured()
+
+                async_hand_over_payload(self.hass, first, info)
+                return self.async_create_entry(title=user_input[CONF_NAME], data=data)
+
+            except InvalidLocations:
+                errors[CONF_LOCATIONS] = "invalid_locations"
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except InvalidAuth:
+                errors["base"] = "invalid_auth"
+            except Exception:
+                errors["base"] = "unknown"
+
+        return self.async_show_form(
+            step_id="batch",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_NAME): str,
+                    vol.Required(CONF_API_KEY): str,
+                    vol.Required(CONF_LOCATIONS): TextSelector(
+                        TextSelectorConfig(multiline=True)
+                    ),
+                    vol.Optional(
+                        CONF_MAX_DAILY_REQUESTS, default=DEFAULT_MAX_DAILY_REQUESTS
+                    ): int,
+                }
+            ),
+            errors=errors,
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -107,6 +240,36 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                             ),
                         ),
                     ): int,
+                    vol.Optional(
+                        CONF_PRIORITY,
+                        default=self.config_entry.options.get(
+                            CONF_PRIORITY, DEFAULT_PRIORITY
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=10)),
+                    vol.Optional(
+                        CONF_FORECAST_FALLBACK,
+                        default=self.config_entry.options.get(
+                            CONF_FORECAST_FALLBACK, DEFAULT_FORECAST_FALLBACK
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_DEDICATED_TRANSPORT,
+                        default=self.config_entry.options.get(
+                            CONF_DEDICATED_TRANSPORT, DEFAULT_DEDICATED_TRANSPORT
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_DAILY_HORIZON,
+                        default=self.config_entry.options.get(
+                            CONF_DAILY_HORIZON, DEFAULT_DAILY_HORIZON
+                        ),
+                    ): vol.All(int, vol.Range(min=1, max=MAX_DAILY_HORIZON)),
+                    vol.Optional(
+                        CONF_HOURLY_HORIZON,
+                        default=self.config_entry.options.get(
+                            CONF_HOURLY_HORIZON, DEFAULT_HOURLY_HORIZON
+                        ),
+                    ): vol.All(int, vol.Range(min=0, max=MAX_HOURLY_HORIZON)),
                 }
             ),
         )
@@ -118,3 +281,7 @@ class CannotConnect(HomeAssistantError):
 
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
+
+
+class InvalidLocations(HomeAssistantError):
+    """Error to indicate the batch locations could not be parsed."""
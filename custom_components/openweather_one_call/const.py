@@ -1,5 +1,20 @@
 """Constants for the OpenWeatherMap One Call integration."""
 
+from homeassistant.components.weather import (
+    ATTR_CONDITION_CLOUDY,
+    ATTR_CONDITION_EXCEPTIONAL,
+    ATTR_CONDITION_FOG,
+    ATTR_CONDITION_HAIL,
+    ATTR_CONDITION_LIGHTNING,
+    ATTR_CONDITION_LIGHTNING_RAINY,
+    ATTR_CONDITION_PARTLYCLOUDY,
+    ATTR_CONDITION_POURING,
+    ATTR_CONDITION_RAINY,
+    ATTR_CONDITION_SNOWY,
+    ATTR_CONDITION_SNOWY_RAINY,
+    ATTR_CONDITION_SUNNY,
+    ATTR_CONDITION_WINDY,
+)
 from homeassistant.const import Platform
 
 DOMAIN = "openweather_one_call"
@@ -10,12 +25,182 @@ CONF_LATITUDE = "latitude"
 CONF_LONGITUDE = "longitude"
 CONF_MAX_DAILY_REQUESTS = "max_daily_requests"
 CONF_NAME = "name"
+CONF_PRIORITY = "priority"
+CONF_FORECAST_FALLBACK = "forecast_fallback"
+CONF_DAILY_HORIZON = "daily_horizon"
+CONF_HOURLY_HORIZON = "hourly_horizon"
+CONF_DEDICATED_TRANSPORT = "dedicated_transport"
+CONF_LOCATIONS = "locations"
 
 # Platforms
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.WEATHER]
 
 # Default values
 DEFAULT_MAX_DAILY_REQUESTS = 1000
+DEFAULT_PRIORITY = 1
+DEFAULT_FORECAST_FALLBACK = False
+DEFAULT_DEDICATED_TRANSPORT = False
+# Days of daily forecast sensors, today and tomorrow, and hours ahead of
+# hourly forecast sensors. The One Call API has 8 days and 48 hours.
+DEFAULT_DAILY_HORIZON = 2
+DEFAULT_HOURLY_HORIZON = 0
+MAX_DAILY_HORIZON = 8
+MAX_HOURLY_HORIZON = 47
+
+# Update intervals (seconds)
+MIN_UPDATE_INTERVAL = 10 * 60
+DEFAULT_UPDATE_INTERVAL = 15 * 60
+# Shortest delay of an overdue refresh; an interval of zero disables polling
+MIN_REFRESH_DELAY = 1
+# Polls follow an expected update of the current conditions by this many
+# seconds, with the cadence learned from the last steps of current.dt
+FRESHNESS_MARGIN = 2 * 60
+FRESHNESS_SAMPLES = 8
+
+# Adaptive polling: the budget interval is scaled by the weather activity.
+# Faster polls leave fewer requests for the rest of the day, which the budget
+# spreads out again, so the daily limit holds.
+ACTIVITY_ACTIVE = "active"
+ACTIVITY_NORMAL = "normal"
+ACTIVITY_CALM = "calm"
+ACTIVITY_INTERVAL_FACTORS = {
+    ACTIVITY_ACTIVE: 0.5,
+    ACTIVITY_NORMAL: 1,
+    ACTIVITY_CALM: 2,
+}
+ACTIVITY_LOOKAHEAD_HOURS = 3
+# Gusts in m/s from which the weather is active (about 50 km/h) and below
+# which it can be calm
+ACTIVITY_GUST_THRESHOLD = 14
+ACTIVITY_CALM_GUST = 8
+# Rise in probability of precipitation over the lookahead that is active,
+# and the probability below which the weather can be calm
+ACTIVITY_POP_RISE = 0.3
+ACTIVITY_CALM_POP = 0.1
+
+# Locations whose coordinates match to this many decimals (about 1 km) share
+# their fetches
+GRID_CELL_DECIMALS = 2
+# Requests in flight at the same time, across all locations
+MAX_CONCURRENT_FETCHES = 4
+
+# Storage
+DATA_BUDGETS = f"{DOMAIN}_budgets"
+DATA_GRID_CELLS = f"{DOMAIN}_grid_cells"
+DATA_FETCH_SEMAPHORE = f"{DOMAIN}_fetch_semaphore"
+DATA_VALIDATION_PAYLOADS = f"{DOMAIN}_validation_payloads"
+DATA_BACKFILLS = f"{DOMAIN}_backfills"
+DATA_HORIZONS = f"{DOMAIN}_horizons"
+DATA_TRANSPORT = f"{DOMAIN}_transport"
+BUDGET_STORAGE_VERSION = 1
+BUDGET_SAVE_DELAY = 30
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+BACKFILL_STORAGE_VERSION = 1
 
 # API
 API_ENDPOINT = "https://api.openweathermap.org/data/3.0/onecall"
+TIMEMACHINE_ENDPOINT = "https://api.openweathermap.org/data/3.0/onecall/timemachine"
+DAY_SUMMARY_ENDPOINT = "https://api.openweathermap.org/data/3.0/onecall/day_summary"
+AIR_POLLUTION_ENDPOINT = "https://api.openweathermap.org/data/2.5/air_pollution"
+AIR_POLLUTION_FORECAST_ENDPOINT = (
+    "https://api.openweathermap.org/data/2.5/air_pollution/forecast"
+)
+
+# Dedicated transport: connections per host, seconds idle connections stay
+# open and seconds DNS lookups are cached
+TRANSPORT_LIMIT_PER_HOST = MAX_CONCURRENT_FETCHES
+TRANSPORT_KEEPALIVE = 2 * 60
+TRANSPORT_DNS_TTL = 10 * 60
+
+# Request retries
+REQUEST_TIMEOUT = 10
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 30
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 60
+BREAKER_MAX_RESET_TIMEOUT = 30 * 60
+
+# Historical backfill: requests in flight per location, hours or days
+# imported per checkpoint, and the part of the remaining daily budget a
+# backfill may use so polling keeps going
+BACKFILL_CONCURRENCY = 2
+BACKFILL_CHUNK_SIZE = 24
+BACKFILL_BUDGET_SHARE = 0.5
+BACKFILL_HOURLY = "hourly"
+BACKFILL_DAILY = "daily"
+SERVICE_BACKFILL = "backfill"
+
+# One Call blocks that can be left out with the exclude parameter
+BLOCK_CURRENT = "current"
+BLOCK_MINUTELY = "minutely"
+BLOCK_HOURLY = "hourly"
+BLOCK_DAILY = "daily"
+BLOCK_ALERTS = "alerts"
+ONECALL_BLOCKS = frozenset(
+    {BLOCK_CURRENT, BLOCK_MINUTELY, BLOCK_HOURLY, BLOCK_DAILY, BLOCK_ALERTS}
+)
+# Datasets of other endpoints, fetched with the One Call requests of a
+# location and kept next to its blocks
+BLOCK_AIR_POLLUTION = "air_pollution"
+BLOCK_AIR_POLLUTION_FORECAST = "air_pollution_forecast"
+DATASET_ENDPOINTS = {
+    BLOCK_AIR_POLLUTION: AIR_POLLUTION_ENDPOINT,
+    BLOCK_AIR_POLLUTION_FORECAST: AIR_POLLUTION_FORECAST_ENDPOINT,
+}
+# Requested until the entities have registered the blocks they read
+DEFAULT_BLOCKS = frozenset({BLOCK_CURRENT, BLOCK_DAILY, BLOCK_ALERTS})
+# Seconds a block is kept from an earlier payload before it is requested
+# again. OpenWeatherMap updates the forecasts and air pollution far less
+# often than the current conditions. Other blocks are requested with every
+# poll.
+BLOCK_MAX_AGE = {
+    BLOCK_HOURLY: 60 * 60,
+    BLOCK_DAILY: 3 * 60 * 60,
+    BLOCK_AIR_POLLUTION: 60 * 60,
+    BLOCK_AIR_POLLUTION_FORECAST: 3 * 60 * 60,
+}
+# Hours of the air pollution forecast its sensors look ahead
+AIR_POLLUTION_FORECAST_HOURS = 24
+
+# Fired when an alert appears in or disappears from the payload
+EVENT_ALERT_STARTED = f"{DOMAIN}_alert_started"
+EVENT_ALERT_ENDED = f"{DOMAIN}_alert_ended"
+
+# Listener context of the diagnostic sensors, updated after every refresh
+METRICS_CONTEXT = "metrics"
+
+# OpenWeatherMap condition codes by Home Assistant weather condition, see
+# https://openweathermap.org/weather-conditions. Clear sky (800) is sunny by
+# day and clear-night by night.
+CONDITION_CLASSES = {
+    ATTR_CONDITION_CLOUDY: [803, 804],
+    ATTR_CONDITION_FOG: [701, 741],
+    ATTR_CONDITION_HAIL: [906],
+    ATTR_CONDITION_LIGHTNING: [210, 211, 212, 221],
+    ATTR_CONDITION_LIGHTNING_RAINY: [200, 201, 202, 230, 231, 232],
+    ATTR_CONDITION_PARTLYCLOUDY: [801, 802],
+    ATTR_CONDITION_POURING: [502, 503, 504, 522],
+    ATTR_CONDITION_RAINY: [300, 301, 302, 310, 311, 312, 313, 314, 321, 500, 501, 520, 521, 531],
+    ATTR_CONDITION_SNOWY: [600, 601, 602, 611, 612, 620, 621, 622],
+    ATTR_CONDITION_SNOWY_RAINY: [511, 613, 615, 616],
+    ATTR_CONDITION_SUNNY: [800],
+    ATTR_CONDITION_WINDY: [905, 951, 952, 953, 954, 955, 956, 957],
+    ATTR_CONDITION_EXCEPTIONAL: [711, 721, 731, 751, 761, 762, 771, 781, 900, 901, 902, 903, 904],
+}
+CONDITION_MAP = {
+    code: condition for condition, codes in CONDITION_CLASSES.items() for code in codes
+}
+
+# Minutely precipitation in mm/h from which the nowcast counts it as raining
+NOWCAST_RAIN_THRESHOLD = 0.1
+
+# Derived forecast aggregates: the hours summed up, the hours searched for a
+# dry window and its highest probability of precipitation, the temperature
+# counted as frost and the base temperature of heating and cooling degree days
+DERIVED_HOURS = 24
+DRY_WINDOW_HOURS = 12
+DRY_WINDOW_MAX_POP = 0.2
+FROST_TEMPERATURE = 0
+DEGREE_DAY_BASE = 18
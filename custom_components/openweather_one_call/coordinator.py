@@ -1,50 +1,428 @@
-from datetime import timedelta
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
 import logging
+import random
+import time
+from typing import Any
 import async_timeout
 import aiohttp
+from aiohttp.hdrs import CONTENT_ENCODING, CONTENT_LENGTH
 
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.exceptions import ConfigEntryAuthFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 
+from .activity import weather_activity
+from .alerts import alert_index, alert_summary
+from .budget import RequestBudget
+from .fallback import forecast_current
+from .freshness import FreshnessTracker
+from .metrics import DurationHistogram, RequestMetrics, RequestTimings
+from .snapshot import OneCallSnapshot, ValueFn
 from .const import (
     DOMAIN,
+    ACTIVITY_INTERVAL_FACTORS,
+    ACTIVITY_NORMAL,
     API_ENDPOINT,
+    BLOCK_AIR_POLLUTION,
+    BLOCK_AIR_POLLUTION_FORECAST,
+    BLOCK_ALERTS,
+    BLOCK_CURRENT,
+    BLOCK_DAILY,
+    BLOCK_HOURLY,
+    BLOCK_MAX_AGE,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT,
+    DATASET_ENDPOINTS,
+    DAY_SUMMARY_ENDPOINT,
+    DEFAULT_BLOCKS,
+    EVENT_ALERT_ENDED,
+    EVENT_ALERT_STARTED,
+    METRICS_CONTEXT,
+    MIN_REFRESH_DELAY,
+    MIN_UPDATE_INTERVAL,
+    ONECALL_BLOCKS,
+    REQUEST_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    TIMEMACHINE_ENDPOINT,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stands in for a dataset that could not be fetched
+_FAILED = object()
+
 
 class OpenWeatherOneCallApi:
-    def __init__(self, session: aiohttp.ClientSession, api_key: str, latitude: float, longitude: float):
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        api_key: str,
+        latitude: float,
+        longitude: float,
+        budget: RequestBudget | None = None,
+        semaphore: asyncio.Semaphore | None = None,
+    ):
         self._session = session
         self._api_key = api_key
         self._latitude = latitude
         self._longitude = longitude
+        self.budget = budget
+        self._semaphore = semaphore
+        self._share_lock = asyncio.Lock()
+        self._shared = None
+        self._datasets: dict[str, tuple[float, Any]] = {}
+        self.breaker = CircuitBreaker()
+        # Failures of the history endpoints must not pause live polling
+        self.history_breaker = CircuitBreaker("history")
+        self.dataset_breakers = {
+            dataset: CircuitBreaker(dataset) for dataset in DATASET_ENDPOINTS
+        }
+        self.metrics = RequestMetrics()
+
+    @callback
+    def async_set_session(self, session: aiohttp.ClientSession) -> None:
+        """Send the following requests over another session."""
+        self._session = session
+
+    async def fetch_shared(
+        self,
+        consumer: object,
+        exclude: Iterable[str] = (),
+        max_age: float = 0,
+        optional: Iterable[str] = (),
+    ):
+        """Fetch data for one of several locations sharing this client.
+
+        When another consumer fetched a payload holding every requested block
+        less than max_age seconds ago, that payload is returned instead of
+        making a request. Optional blocks are requested, but a shared payload
+        without them will do. Calls are serialized, so consumers polling at
+        the same time share a single request.
+        """
+        blocks = ONECALL_BLOCKS.difference(exclude)
+        async with self._share_lock:
+            if self._shared is not None:
+                fetched_at, fetched_blocks, fetched_by, data = self._shared
+                if (
+                    fetched_by is not consumer
+                    and fetched_blocks >= blocks.difference(optional)
+                    and time.monotonic() - fetched_at < max_age
+                ):
+                    self.metrics.shared += 1
+                    return data
+            data = await self.fetch_data(exclude)
+            self._shared = (time.monotonic(), blocks, consumer, data)
+            return data
+
+    async def fetch_data(self, exclude: Iterable[str] = ()):
+        """Fetch data from API endpoint, leaving out the excluded blocks."""
+        params = self._params()
+        if exclude:
+            params["exclude"] = ",".join(sorted(exclude))
+        return await self._fetch(API_ENDPOINT, params)
+
+    async def fetch_dataset(self, dataset: str, max_age: float = 0):
+        """Fetch a dataset of another endpoint, as kept next to the One Call blocks.
 
-    async def fetch_data(self):
-        """Fetch data from API endpoint."""
-        params = {
+        The current air pollution is a single entry, its forecast a list of
+        hours. A dataset fetched less than max_age seconds ago, by any
+        location sharing this client, is returned from cache. Datasets are
+        billed apart from One Call, so they do not count against the budget.
+        Each has its own breaker and failures are not retried, the last value
+        is kept until the next poll.
+        """
+        if (cached := self._datasets.get(dataset)) is not None:
+            fetched_at, value = cached
+            if time.monotonic() - fetched_at < max_age:
+                self.metrics.shared += 1
+                return value
+        data = await self._fetch(
+            DATASET_ENDPOINTS[dataset],
+            self._params(),
+            budgeted=False,
+            breaker=self.dataset_breakers[dataset],
+            retries=0,
+        )
+        entries = data.get("list") or []
+        if dataset == BLOCK_AIR_POLLUTION:
+            value = entries[0] if entries else None
+        else:
+            value = entries
+        self._datasets[dataset] = (time.monotonic(), value)
+        return value
+
+    async def fetch_timemachine(self, timestamp: int):
+        """Fetch the historical weather at a Unix timestamp, without retries."""
+        return await self._fetch(
+            TIMEMACHINE_ENDPOINT,
+            self._params(dt=timestamp),
+            breaker=self.history_breaker,
+            retries=0,
+        )
+
+    async def fetch_day_summary(self, day: date):
+        """Fetch the aggregated weather of a past day in local time, without retries."""
+        return await self._fetch(
+            DAY_SUMMARY_ENDPOINT,
+            self._params(date=day.isoformat()),
+            breaker=self.history_breaker,
+            retries=0,
+        )
+
+    def _params(self, **params) -> dict:
+        return {
             "lat": self._latitude,
             "lon": self._longitude,
             "appid": self._api_key,
             "units": "metric",  # Use metric units
+            **params,
         }
-        async with self._session.get(API_ENDPOINT, params=params) as response:
-            if response.status == 401:
-                raise ApiAuthError("Invalid API key")
-            if response.status != 200:
-                raise ApiError(f"Error communicating with API: {response.status}")
-            return await response.json()
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        params: dict,
+        budgeted: bool = True,
+        breaker: "CircuitBreaker | None" = None,
+        retries: int = RETRY_ATTEMPTS,
+    ):
+        """Fetch from an endpoint with retries.
+
+        Connection problems, timeouts and server errors are retried with
+        exponential backoff and jitter. Rate limits are retried after the
+        delay the server asks for, unless it is longer than we are willing
+        to wait. Every attempt of a budgeted fetch counts against the request
+        budget. Failures are recorded on the given breaker, the One Call
+        breaker by default.
+        """
+        breaker = breaker or self.breaker
+        breaker.check()
+        attempt = 0
+        while True:
+            try:
+                data = await self._request(endpoint, params, budgeted)
+            except ApiRateLimited as err:
+                self.metrics.errors["rate_limited"] += 1
+                if attempt >= retries or err.retry_after > RETRY_MAX_DELAY:
+                    raise
+                delay = err.retry_after or _backoff(attempt)
+            except (ApiServerError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+                self.metrics.errors[_error_kind(err)] += 1
+                breaker.record_failure()
+                if attempt >= retries or not breaker.allows_request:
+                    raise
+                delay = _backoff(attempt)
+            except ApiError as err:
+                self.metrics.errors[_error_kind(err)] += 1
+                raise
+            else:
+                breaker.record_success()
+                return data
+            attempt += 1
+            self.metrics.retries += 1
+            _LOGGER.debug("Retrying One Call request in %.1f seconds", delay)
+            await asyncio.sleep(delay)
+
+    async def _request(self, endpoint: str, params: dict, budgeted: bool = True):
+        """Make a single request."""
+        if budgeted and self.budget is not None and not self.budget.async_acquire():
+            raise ApiBudgetExhausted("Daily request budget exhausted")
+        async with self._semaphore or nullcontext():
+            self.metrics.requests += 1
+            self.metrics.endpoints[endpoint.rpartition("/data/")[2]] += 1
+            start = time.perf_counter()
+            timings = RequestTimings()
+            async with async_timeout.timeout(REQUEST_TIMEOUT):
+                async with self._session.get(
+                    endpoint, params=params, trace_request_ctx=timings
+                ) as response:
+                    if response.status == 401:
+                        raise ApiAuthError("Invalid API key")
+                    if response.status == 429:
+                        raise ApiRateLimited(
+                            _parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                    if response.status >= 500:
+                        raise ApiServerError(f"Error communicating with API: {response.status}")
+                    if response.status != 200:
+                        raise ApiError(f"Error communicating with API: {response.status}")
+                    body = await response.read()
+        end = time.perf_counter()
+        self.metrics.latency.observe(end - start)
+        # The length header is the compressed size, when the server sends it
+        self.metrics.observe_transfer(
+            timings,
+            end,
+            int(response.headers.get(CONTENT_LENGTH, len(body))),
+            CONTENT_ENCODING in response.headers,
+        )
+        return self._decode(body)
+
+    def _decode(self, body: bytes):
+        """Decode a response body on the event loop.
+
+        Even the largest payloads decode in well under a millisecond, less
+        than a round trip through the executor takes.
+        """
+        start = time.perf_counter()
+        try:
+            data = json_loads(body)
+        except JSON_DECODE_EXCEPTIONS as err:
+            raise ApiServerError(f"Invalid response from API: {err}") from err
+        decode_time = time.perf_counter() - start
+
+        self.metrics.decode.observe(decode_time)
+        self.metrics.last_payload_bytes = len(body)
+        self.metrics.total_payload_bytes += len(body)
+        _LOGGER.debug("Decoded %s bytes in %.2f ms", len(body), decode_time * 1000)
+        return data
+
+
+class CircuitBreaker:
+    """Stop requests to the API after repeated failures.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the breaker opens
+    and requests fail immediately. Once the reset timeout has passed a single
+    trial request is let through; if it fails the breaker opens again with a
+    doubled timeout.
+    """
+
+    def __init__(self, name: str = "One Call"):
+        self.name = name
+        self.failures = 0
+        self.reset_timeout = BREAKER_RESET_TIMEOUT
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while the breaker is open."""
+        return self._opened_at is not None
+
+    @property
+    def allows_request(self) -> bool:
+        """Return True if a request may be made now."""
+        return (
+            self._opened_at is None
+            or time.monotonic() - self._opened_at >= self.reset_timeout
+        )
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the next request is allowed."""
+        if self._opened_at is None:
+            return 0
+        return max(self._opened_at + self.reset_timeout - time.monotonic(), 0)
+
+    def check(self) -> None:
+        """Raise ApiCircuitOpen if no request may be made now."""
+        if not self.allows_request:
+            raise ApiCircuitOpen(
+                f"Requests paused for {self.retry_in:.0f} seconds after repeated failures"
+            )
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.reset_timeout = BREAKER_RESET_TIMEOUT
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None:
+            # The trial request after the reset timeout failed
+            self.reset_timeout = min(self.reset_timeout * 2, BREAKER_MAX_RESET_TIMEOUT)
+            self._opened_at = time.monotonic()
+        elif self.failures >= BREAKER_FAILURE_THRESHOLD:
+            _LOGGER.warning(
+                "Pausing %s requests for %s seconds after %s failures",
+                self.name,
+                self.reset_timeout,
+                self.failures,
+            )
+            self._opened_at = time.monotonic()
+
+
+def _error_kind(err: Exception) -> str:
+    """Return the metrics key of a request error."""
+    if isinstance(err, asyncio.TimeoutError):
+        return "timeout"
+    if isinstance(err, aiohttp.ClientError):
+        return "connection"
+    if isinstance(err, ApiServerError):
+        return "server"
+    if isinstance(err, ApiAuthError):
+        return "auth"
+    if isinstance(err, ApiBudgetExhausted):
+        return "budget_exhausted"
+    return "other"
+
+
+def _drop_expired(data: dict, now: float) -> dict:
+    """Return data without the forecast entries that are over at now.
+
+    Hours are over when the next one starts, days at local midnight in the
+    time zone of the data.
+    """
+    offset = data.get("timezone_offset", 0)
+    data = dict(data)
+    for block in (BLOCK_HOURLY, BLOCK_AIR_POLLUTION_FORECAST):
+        if data.get(block):
+            data[block] = [hour for hour in data[block] if (hour.get("dt") or 0) + 3600 > now]
+    if data.get(BLOCK_DAILY):
+        today = (now + offset) // 86400
+        data[BLOCK_DAILY] = [
+            day for day in data[BLOCK_DAILY] if ((day.get("dt") or 0) + offset) // 86400 >= today
+        ]
+    return data
+
+
+def _backoff(attempt: int) -> float:
+    """Return an exponential backoff delay with jitter for a retry attempt."""
+    delay = min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _parse_retry_after(value: str | None) -> float:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return 0
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0
+    return max((retry_at - dt_util.utcnow()).total_seconds(), 0)
 
 
 class OpenWeatherOneCallCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    def __init__(self, hass: HomeAssistant, api: OpenWeatherOneCallApi, update_interval: timedelta):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: OpenWeatherOneCallApi,
+        update_interval: timedelta,
+        store: Store | None = None,
+        location_id: str | None = None,
+        location_name: str | None = None,
+    ):
         """Initialize."""
         super().__init__(
             hass,
@@ -53,18 +431,513 @@ class OpenWeatherOneCallCoordinator(DataUpdateCoordinator):
             update_interval=update_interval,
         )
         self.api = api
+        # Identify the device of the location, the config entry of single
+        # location entries
+        self.location_id = location_id
+        self.location_name = location_name
+        self.snapshot: OneCallSnapshot | None = None
+        self.last_fetch = None
+        # True while the snapshot holds current values estimated from the
+        # hourly forecast of the last payload, because the API is failing
+        self.serving_forecast = False
+        self._forecast_fallback = False
+        self.freshness = FreshnessTracker()
+        # How eventful the weather in the last payload is, see weather_activity
+        self.activity = ACTIVITY_NORMAL
+        self.activity_reasons: tuple[str, ...] = ()
+        self._value_fns: dict[str, ValueFn] = {}
+        self._significant_changes: dict[str, float] = {}
+        self._changed_keys: set[str] | None = None
+        self._last_dispatch_success = True
+        self.writes_performed = 0
+        self.writes_skipped = 0
+        self._block_users: Counter[str] = Counter()
+        self._fetched_blocks = DEFAULT_BLOCKS
+        # When each block of the data was fetched, see BLOCK_MAX_AGE
+        self.block_fetched: dict[str, datetime] = {}
+        self._store = store
+        self._budget_interval = update_interval
+        self._next_refresh_delay = None
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.refresh_time = DurationHistogram()
+        self.last_error: str | None = None
+
+    @callback
+    def async_set_budget_interval(self, interval: timedelta) -> None:
+        """Apply the polling interval assigned by the shared request budget."""
+        self._budget_interval = interval
+        if self._next_refresh_delay is None:
+            self.update_interval = self._poll_interval
+
+    @property
+    def _poll_interval(self) -> timedelta:
+        """Return the budget interval scaled by the weather activity.
+
+        Polling faster leaves fewer requests for the rest of the day, which
+        lengthens the budget intervals to come, so the daily limit holds.
+        Without requests left the budget interval waits for the reset.
+        """
+        budget = self.api.budget
+        if budget is not None and budget.remaining <= 0:
+            return self._budget_interval
+        return max(
+            self._budget_interval * ACTIVITY_INTERVAL_FACTORS[self.activity],
+            timedelta(seconds=MIN_UPDATE_INTERVAL),
+        )
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Move a running timer to one budget interval after the last fetch.
+
+        Lets option changes apply to the next refresh without a reload. Without
+        a running timer, as during a refresh, the next refresh is scheduled
+        with the new interval anyway. An overdue refresh runs right away.
+        """
+        if self._unsub_refresh is None or self.last_fetch is None:
+            return
+        due = self.last_fetch + self._poll_interval - dt_util.utcnow()
+        self._next_refresh_delay = max(due, timedelta(seconds=MIN_REFRESH_DELAY))
+        self.update_interval = self._next_refresh_delay
+        self._schedule_refresh()
+
+    @callback
+    def async_set_forecast_fallback(self, enabled: bool) -> None:
+        """Serve current values from the hourly forecast while the API is failing.
+
+        The hourly block is added to the next regular request, no refresh is
+        made for it.
+        """
+        self._forecast_fallback = enabled
+
+    @callback
+    def async_stagger(self, phase: float) -> None:
+        """Move the next refresh to between half and all of the interval.
+
+        Locations set up together would otherwise poll in lockstep. The phase
+        is a fraction in [0, 1), shared by locations in the same grid cell so
+        they keep polling together and share their fetches.
+        """
+        self._next_refresh_delay = self._poll_interval * (0.5 + phase / 2)
+        self.update_interval = self._next_refresh_delay
+
+    @callback
+    def async_add_value(
+        self, key: str, value_fn: ValueFn, significant_change: float | None = None
+    ) -> Callable[[], None]:
+        """Extract a value into every snapshot and return a callback to stop.
+
+        Numeric values that move less than significant_change from the value
+        last handed to the entity are not dispatched.
+        """
+        self._value_fns[key] = value_fn
+        if significant_change is not None:
+            self._significant_changes[key] = significant_change
+        if self.snapshot is not None:
+            self.snapshot.values[key] = value_fn(self.snapshot)
+
+        @callback
+        def remove_value() -> None:
+            self._value_fns.pop(key, None)
+            self._significant_changes.pop(key, None)
+
+        return remove_value
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the listeners whose value changed in the new snapshot.
+
+        Listeners without a context or with METRICS_CONTEXT, and all
+        listeners after a change in availability or a manual data update, are
+        always updated.
+        """
+        changed = self._changed_keys
+        self._changed_keys = None
+        if self.last_update_success != self._last_dispatch_success:
+            changed = None
+        self._last_dispatch_success = self.last_update_success
+
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                changed is None
+                or context in (None, METRICS_CONTEXT)
+                or context in changed
+            ):
+                self.writes_performed += 1
+                update_callback()
+            else:
+                self.writes_skipped += 1
+
+    @callback
+    def _async_update_metrics_listeners(self) -> None:
+        """Update the listeners showing runtime metrics."""
+        for update_callback, context in list(self._listeners.values()):
+            if context == METRICS_CONTEXT:
+                update_callback()
+
+    @property
+    def requested_blocks(self) -> frozenset[str]:
+        """Return the One Call blocks read by the registered entities."""
+        blocks = frozenset(self._block_users) if self._block_users else DEFAULT_BLOCKS
+        if self._forecast_fallback and BLOCK_CURRENT in blocks:
+            return blocks | {BLOCK_HOURLY}
+        return blocks
+
+    @callback
+    def async_require_blocks(
+        self, blocks: Iterable[str], refresh: bool = True
+    ) -> Callable[[], None]:
+        """Request blocks for an entity and return a callback to release them.
+
+        Blocks missing from the current data, for instance after an entity
+        that reads them was enabled, trigger a refresh to fetch them. Without
+        refresh they are added to the next scheduled request.
+        """
+        blocks = tuple(blocks)
+        self._block_users.update(blocks)
+        if (
+            refresh
+            and self.data is not None
+            and not self._fetched_blocks.issuperset(blocks)
+        ):
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def release_blocks() -> None:
+            self._block_users.subtract(blocks)
+            self._block_users += Counter()  # Drop blocks without users
+
+        return release_blocks
+
+    async def async_fetch_blocks(self, blocks: Iterable[str]) -> None:
+        """Fetch blocks missing from the data right away, for a one-off read.
+
+        Blocks nobody requires are kept while within their BLOCK_MAX_AGE, so
+        reads following shortly after do not make another request.
+        """
+        if self._fetched_blocks.issuperset(blocks):
+            return
+        release = self.async_require_blocks(blocks, refresh=False)
+        try:
+            await self.async_refresh()
+        finally:
+            release()
+
+    async def async_restore(self) -> bool:
+        """Load the last stored payload if it is still within the update interval.
+
+        On success the first scheduled refresh is moved to when the stored
+        payload becomes due, so a restart neither spends a request nor waits
+        on the network.
+        """
+        if self._store is None or (stored := await self._store.async_load()) is None:
+            return False
+        fetched = dt_util.parse_datetime(stored.get("fetched") or "")
+        if fetched is None or stored.get("data") is None:
+            return False
+        block_fetched = {
+            block: parsed
+            for block, value in (stored.get("block_fetched") or {}).items()
+            if (parsed := dt_util.parse_datetime(value)) is not None
+        }
+        if not self.async_adopt(
+            stored["data"],
+            fetched,
+            stored.get("blocks", DEFAULT_BLOCKS),
+            block_fetched,
+        ):
+            return False
+        _LOGGER.debug("Restored %s data fetched at %s", self.name, fetched)
+        return True
+
+    @callback
+    def async_adopt(
+        self,
+        data: dict,
+        fetched: datetime,
+        blocks: Iterable[str],
+        block_fetched: dict[str, datetime] | None = None,
+    ) -> bool:
+        """Use a payload fetched elsewhere if it is still within the update interval.
+
+        Blocks kept from earlier payloads can be older than the payload, as
+        given by block_fetched. The first scheduled refresh is moved to when
+        the payload becomes due.
+        """
+        age = dt_util.utcnow() - fetched
+        if age >= self._budget_interval:
+            return False
+
+        self.data = _drop_expired(data, dt_util.utcnow().timestamp())
+        self._fetched_blocks = frozenset(blocks)
+        self.block_fetched = {
+            block: (block_fetched or {}).get(block, fetched)
+            for block in self._fetched_blocks
+        }
+        self.snapshot = OneCallSnapshot(self.data, self._value_fns)
+        self.freshness.observe(self.data, count=False)
+        self.activity, self.activity_reasons = weather_activity(self.snapshot)
+        self.last_fetch = fetched
+        self.last_update_success = True
+        # Faster polling in active weather can make the payload due already
+        self._next_refresh_delay = max(
+            self._poll_interval - age, timedelta(seconds=MIN_REFRESH_DELAY)
+        )
+        self.update_interval = self._next_refresh_delay
+        return True
 
     async def _async_update_data(self):
-        """Fetch data from API endpoint."""
+        """Fetch data from API endpoint and record how the refresh went."""
+        self.refreshes += 1
+        start = time.perf_counter()
+        try:
+            return await self._async_fetch()
+        except Exception as err:
+            self.failed_refreshes += 1
+            self.last_error = str(err) or type(err).__name__
+            serving_forecast = self.serving_forecast
+            self._async_serve_forecast()
+            # Listeners are not updated on repeated failures, metrics and
+            # forecast values still are
+            if not self.last_update_success:
+                if serving_forecast or self.serving_forecast:
+                    self.async_update_listeners()
+                else:
+                    self._async_update_metrics_listeners()
+            raise
+        finally:
+            self.refresh_time.observe(time.perf_counter() - start)
+
+    async def _async_fetch(self):
+        self._next_refresh_delay = None
+        self.update_interval = self._poll_interval
+        blocks = self.requested_blocks
+        due, optional = self._blocks_due(blocks)
+        max_age = self._budget_interval.total_seconds() / 2
+        datasets = tuple(due - ONECALL_BLOCKS)
         try:
-            async with async_timeout.timeout(10):
-                return await self.api.fetch_data()
+            if due & ONECALL_BLOCKS:
+                data, *dataset_values = await asyncio.gather(
+                    self.api.fetch_shared(
+                        self,
+                        exclude=ONECALL_BLOCKS - due,
+                        max_age=max_age,
+                        optional=optional,
+                    ),
+                    *(self._async_fetch_dataset(dataset, max_age) for dataset in datasets),
+                )
+            else:
+                # A One Call request without blocks would cost a request for
+                # nothing, the rest of the last payload is kept instead
+                data = {
+                    key: value
+                    for key, value in (self.data or {}).items()
+                    if key not in ONECALL_BLOCKS and key not in DATASET_ENDPOINTS
+                }
+                dataset_values = await asyncio.gather(
+                    *(self._async_fetch_dataset(dataset, max_age) for dataset in datasets)
+                )
         except ApiAuthError as err:
             raise ConfigEntryAuthFailed from err
+        except ApiRateLimited as err:
+            # Do not come back before the server wants us to
+            if err.retry_after > self._budget_interval.total_seconds():
+                self.update_interval = timedelta(seconds=err.retry_after)
+            raise UpdateFailed(str(err))
+        except ApiCircuitOpen as err:
+            self.update_interval = max(
+                self._budget_interval, timedelta(seconds=self.api.breaker.retry_in)
+            )
+            raise UpdateFailed(str(err))
         except ApiError as err:
             raise UpdateFailed(str(err))
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
+        except asyncio.TimeoutError as err:
+            raise UpdateFailed("Timeout communicating with API") from err
+
+        self.last_fetch = dt_util.utcnow()
+        stale = self.freshness.observe(data)
+        fetched = {
+            dataset: value
+            for dataset, value in zip(datasets, dataset_values)
+            if value is not _FAILED
+        }
+        # A shared payload can hold more blocks than were requested
+        fresh = (
+            (due & ONECALL_BLOCKS).difference(optional)
+            | ONECALL_BLOCKS.intersection(data)
+            | fetched.keys()
+        )
+        kept = (blocks - fresh) & self._fetched_blocks
+        # Blocks nobody reads any more are kept while fresh, for one-off reads
+        kept |= self._blocks_unused_but_fresh(blocks | fresh)
+        # Forecasts kept from earlier payloads, or shared by another location,
+        # start with the hour or day of now
+        data = _drop_expired(
+            {
+                **data,
+                **fetched,
+                **{block: self.data[block] for block in kept if block in self.data},
+            },
+            self.last_fetch.timestamp(),
+        )
+        # A repeated response changes nothing, the entities are left alone
+        if (
+            stale
+            and not self.serving_forecast
+            and self._fetched_blocks >= blocks
+            and data == self.data
+        ):
+            self._changed_keys = set()
+            self._async_schedule_next_refresh()
+            return self.data
+
+        previous, previous_blocks = self.snapshot, self._fetched_blocks
+        self._fetched_blocks = frozenset(fresh | kept)
+        self.block_fetched = {
+            **{block: self.block_fetched[block] for block in kept},
+            **dict.fromkeys(fresh, self.last_fetch),
+        }
+        self.serving_forecast = False
+        self.snapshot = OneCallSnapshot(data, self._value_fns)
+        self._changed_keys = self.snapshot.changed_keys(
+            previous, self._significant_changes
+        )
+        # Without alerts in both payloads there is nothing to compare
+        if previous is not None and BLOCK_ALERTS in previous_blocks & blocks:
+            self._async_fire_alert_events(previous, self.snapshot)
+        self.activity, self.activity_reasons = weather_activity(self.snapshot)
+        self._async_schedule_next_refresh()
+        self.async_save_snapshot()
+        return data
+
+    async def _async_fetch_dataset(self, dataset: str, max_age: float) -> Any:
+        """Fetch a dataset, or return _FAILED so the last one is kept.
+
+        Only a failed One Call request fails the refresh.
+        """
+        try:
+            return await self.api.fetch_dataset(dataset, max_age)
+        except (ApiError, aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Error fetching %s for %s: %s", dataset, self.location_name, err)
+            return _FAILED
+
+    def _blocks_due(self, blocks: frozenset[str]) -> tuple[frozenset[str], frozenset[str]]:
+        """Return the blocks to request, and those of them that may wait a poll.
+
+        A block kept from earlier payloads is requested again when it would
+        be older than its BLOCK_MAX_AGE by the next poll. Until it is older
+        already, a payload shared by another location without it will do.
+        Every request counts once against the budget whatever it holds, so
+        polls keep the interval that gives the freshest current conditions
+        and the forecasts ride along when they are due. The daily forecast
+        is due after local midnight too, to get the day that was added.
+        """
+        now = dt_util.utcnow()
+        offset = timedelta(seconds=(self.data or {}).get("timezone_offset", 0))
+        interval = self._poll_interval
+        due = set(blocks)
+        optional = set()
+        for block in blocks & self._fetched_blocks & BLOCK_MAX_AGE.keys():
+            max_age = timedelta(seconds=BLOCK_MAX_AGE[block])
+            fetched = self.block_fetched.get(block, now - max_age)
+            if block == BLOCK_DAILY and (fetched + offset).date() != (now + offset).date():
+                continue
+            age = now - fetched
+            if age + interval <= max_age:
+                due.discard(block)
+            elif age < max_age:
+                optional.add(block)
+        return frozenset(due), frozenset(optional)
+
+    def _blocks_unused_but_fresh(self, used: frozenset[str]) -> frozenset[str]:
+        """Return the fetched blocks outside used still within their BLOCK_MAX_AGE.
+
+        Before the first payload the default blocks have no fetch time, and
+        are not kept.
+        """
+        now = dt_util.utcnow()
+        return frozenset(
+            block
+            for block in (self._fetched_blocks - used) & BLOCK_MAX_AGE.keys()
+            if (fetched := self.block_fetched.get(block)) is not None
+            and now - fetched < timedelta(seconds=BLOCK_MAX_AGE[block])
+        )
+
+    @callback
+    def _async_schedule_next_refresh(self) -> None:
+        """Set the next refresh one poll interval away, just after an expected update."""
+        interval = self._poll_interval
+        now = self.last_fetch.timestamp()
+        delay = self.freshness.aligned_delay(now, now + interval.total_seconds())
+        if delay is not None:
+            self._next_refresh_delay = timedelta(seconds=delay)
+            self.update_interval = self._next_refresh_delay
+        else:
+            self.update_interval = interval
+
+    @callback
+    def _async_serve_forecast(self) -> None:
+        """Replace the current values with the hourly forecast for now.
+
+        The estimate is made from the last successful payload on every failed
+        refresh, so it follows the forecast while the outage lasts, until the
+        payload has no hourly forecast covering now.
+        """
+        current = None
+        if self._forecast_fallback and self.data is not None:
+            current = forecast_current(self.data, dt_util.utcnow().timestamp())
+        if current is None:
+            if self.serving_forecast:
+                self.serving_forecast = False
+                self._changed_keys = None
+            return
+        previous = self.snapshot
+        self.snapshot = OneCallSnapshot(
+            {**self.data, "current": current}, self._value_fns
+        )
+        self._changed_keys = self.snapshot.changed_keys(
+            previous, self._significant_changes
+        )
+        self.serving_forecast = True
+
+    @callback
+    def _async_fire_alert_events(
+        self, previous: OneCallSnapshot, snapshot: OneCallSnapshot
+    ) -> None:
+        """Fire an event for every alert that started or ended between payloads."""
+        old, new = alert_index(previous), alert_index(snapshot)
+        for key in new.keys() - old.keys():
+            self.hass.bus.async_fire(
+                EVENT_ALERT_STARTED,
+                {
+                    "location": self.location_name,
+                    **alert_summary(key, new[key]),
+                    "description": new[key].get("description"),
+                },
+            )
+        for key in old.keys() - new.keys():
+            self.hass.bus.async_fire(
+                EVENT_ALERT_ENDED,
+                {"location": self.location_name, **alert_summary(key, old[key])},
+            )
+
+    @callback
+    def async_save_snapshot(self) -> None:
+        """Store the current payload for the next start."""
+        if self._store is not None:
+            self._store.async_delay_save(self._snapshot_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot_to_save(self) -> dict:
+        return {
+            "fetched": self.last_fetch.isoformat(),
+            "blocks": sorted(self._fetched_blocks),
+            "block_fetched": {
+                block: fetched.isoformat() for block, fetched in self.block_fetched.items()
+            },
+            "data": self.data,
+        }
 
 
 class ApiError(Exception):
@@ -73,3 +946,23 @@ class ApiError(Exception):
 
 class ApiAuthError(ApiError):
     """Raised when API key is invalid."""
+
+
+class ApiBudgetExhausted(ApiError):
+    """Raised when the daily request budget for the API key is spent."""
+
+
+class ApiServerError(ApiError):
+    """Raised when the API returns a server error."""
+
+
+class ApiRateLimited(ApiError):
+    """Raised when the API rejects a request because of its rate limit."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited by API, retry after {retry_after:.0f} seconds")
+        self.retry_after = retry_after
+
+
+class ApiCircuitOpen(ApiError):
+    """Raised while requests are paused after repeated failures."""
@@ -0,0 +1,89 @@
+"""Aggregates over the hourly and daily forecast blocks."""
+from typing import Any
+
+from .const import (
+    DEGREE_DAY_BASE,
+    DERIVED_HOURS,
+    DRY_WINDOW_HOURS,
+    DRY_WINDOW_MAX_POP,
+    FROST_TEMPERATURE,
+)
+from .snapshot import OneCallSnapshot, as_utc_datetime
+
+DERIVED_KEYS = (
+    "precipitation_next_24h",
+    "max_gust_next_24h",
+    "frost_hours_next_24h",
+    "dry_window_start",
+    "dry_window_hours",
+    "heating_degree_days",
+    "cooling_degree_days",
+)
+
+
+def compute_derived(snapshot: OneCallSnapshot) -> dict[str, Any]:
+    """Compute every aggregate in one pass over each forecast block.
+
+    Aggregates of a block missing from the payload are None.
+    """
+    derived = dict.fromkeys(DERIVED_KEYS)
+    if hours := snapshot.hourly[:DERIVED_HOURS]:
+        derived.update(_hourly_aggregates(hours))
+    if days := snapshot.daily:
+        derived.update(_daily_aggregates(days))
+    return derived
+
+
+def _hourly_aggregates(hours: list[dict[str, Any]]) -> dict[str, Any]:
+    precipitation = 0.0
+    max_gust = None
+    frost_hours = 0
+    # Longest run of dry hours within the dry window hours, the earliest on ties
+    best_start = best_length = run = 0
+
+    for index, hour in enumerate(hours):
+        rain, snow = hour.get("rain"), hour.get("snow")
+        amount = (rain.get("1h") or 0 if rain else 0) + (snow.get("1h") or 0 if snow else 0)
+        precipitation += amount
+        gust = hour.get("wind_gust") or hour.get("wind_speed")
+        if gust is not None and (max_gust is None or gust > max_gust):
+            max_gust = gust
+        temp = hour.get("temp")
+        if temp is not None and temp < FROST_TEMPERATURE:
+            frost_hours += 1
+        if index < DRY_WINDOW_HOURS:
+            if (hour.get("pop") or 0) <= DRY_WINDOW_MAX_POP and not amount:
+                run += 1
+                if run > best_length:
+                    best_start, best_length = index - run + 1, run
+            else:
+                run = 0
+
+    return {
+        "precipitation_next_24h": round(precipitation, 2),
+        "max_gust_next_24h": max_gust,
+        "frost_hours_next_24h": frost_hours,
+        "dry_window_start": as_utc_datetime(hours[best_start].get("dt"))
+        if best_length
+        else None,
+        "dry_window_hours": best_length,
+    }
+
+
+def _daily_aggregates(days: list[dict[str, Any]]) -> dict[str, Any]:
+    """Sum the degree days of each day from the mean of its low and high."""
+    heating = cooling = 0.0
+    for day in days:
+        temp = day.get("temp") or {}
+        low, high = temp.get("min"), temp.get("max")
+        if low is None or high is None:
+            continue
+        mean = (low + high) / 2
+        if mean < DEGREE_DAY_BASE:
+            heating += DEGREE_DAY_BASE - mean
+        else:
+            cooling += mean - DEGREE_DAY_BASE
+    return {
+        "heating_degree_days": round(heating, 1),
+        "cooling_degree_days": round(cooling, 1),
+    }
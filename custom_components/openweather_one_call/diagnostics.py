@@ -0,0 +1,73 @@
+"""Diagnostics support for OpenWeatherMap One Call."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
+from .coordinator import OpenWeatherOneCallCoordinator
+
+# The payload repeats the location as lat/lon
+TO_REDACT = {CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE, "lat", "lon"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinators: list[OpenWeatherOneCallCoordinator] = hass.data[DOMAIN][entry.entry_id]
+    budget = coordinators[0].api.budget
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "budget": None
+        if budget is None
+        else {
+            "used": budget.used,
+            "limit": budget.limit,
+            "remaining": budget.remaining,
+        },
+        "locations": [
+            _location_diagnostics(coordinator) for coordinator in coordinators
+        ],
+    }
+
+
+def _location_diagnostics(coordinator: OpenWeatherOneCallCoordinator) -> dict[str, Any]:
+    api = coordinator.api
+    return {
+        "name": coordinator.location_name,
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_fetch": coordinator.last_fetch,
+            "last_error": coordinator.last_error,
+            "serving_forecast": coordinator.serving_forecast,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "activity": coordinator.activity,
+            "activity_reasons": list(coordinator.activity_reasons),
+            "requested_blocks": sorted(coordinator.requested_blocks),
+            "block_fetched": coordinator.block_fetched,
+            "refreshes": coordinator.refreshes,
+            "failed_refreshes": coordinator.failed_refreshes,
+            "refresh_time": coordinator.refresh_time.as_dict(),
+            "writes_performed": coordinator.writes_performed,
+            "writes_skipped": coordinator.writes_skipped,
+            "freshness": coordinator.freshness.as_dict(),
+        },
+        # Shared by the locations in the same grid cell
+        "api": {
+            **api.metrics.as_dict(),
+            "circuit_open": api.breaker.is_open,
+            "history_circuit_open": api.history_breaker.is_open,
+            "dataset_circuits_open": sorted(
+                dataset
+                for dataset, breaker in api.dataset_breakers.items()
+                if breaker.is_open
+            ),
+        },
+        "data": async_redact_data(coordinator.data, TO_REDACT),
+    }
@@ -0,0 +1,94 @@
+"""Base entity for the OpenWeatherMap One Call integration."""
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import OpenWeatherOneCallCoordinator
+from .snapshot import ValueFn
+
+
+class OpenWeatherOneCallEntity(CoordinatorEntity[OpenWeatherOneCallCoordinator]):
+    """Entity linked to the device of a One Call location.
+
+    The value function is run by the coordinator once per payload and the
+    result is handed to ``_async_set_value``. The value key doubles as the
+    listener context, so the coordinator only updates this entity when its
+    value changed. Entities without a value function read the coordinator
+    directly in ``_update_from_snapshot``.
+    """
+
+    _attr_has_entity_name = True
+    # One Call blocks this entity reads, see ONECALL_BLOCKS
+    _required_blocks: tuple[str, ...] = ()
+    # Smallest change of a numeric value that is written to the state machine
+    _significant_change: float | None = None
+    # Stays available with values from the hourly forecast while the API is
+    # failing, marked with a source attribute
+    _forecast_fallback = False
+
+    def __init__(
+        self,
+        coordinator: OpenWeatherOneCallCoordinator,
+        config_entry: ConfigEntry,
+        value_key: str,
+        value_fn: ValueFn | None,
+    ):
+        """Pass coordinator to CoordinatorEntity."""
+        super().__init__(coordinator, context=value_key)
+        self.config_entry = config_entry
+        self._value_key = value_key
+        self._value_fn = value_fn
+        self._location_id = coordinator.location_id
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.location_id)},
+            name=coordinator.location_name,
+            manufacturer="Lomion-tm",
+            model="One Call API 3.0",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Register the value and the blocks it reads while enabled."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_require_blocks(self._required_blocks)
+        )
+        if self._value_fn is not None:
+            self.async_on_remove(
+                self.coordinator.async_add_value(
+                    self._value_key, self._value_fn, self._significant_change
+                )
+            )
+        self._update_from_snapshot()
+
+    @property
+    def available(self) -> bool:
+        """Return if the coordinator has live or, if allowed, forecast data."""
+        return super().available or (
+            self._forecast_fallback and self.coordinator.serving_forecast
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Take the precomputed value from the new snapshot."""
+        self._update_from_snapshot()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _update_from_snapshot(self) -> None:
+        snapshot = self.coordinator.snapshot
+        self._async_set_value(
+            snapshot.values.get(self._value_key) if snapshot is not None else None
+        )
+        if self._forecast_fallback:
+            self._attr_extra_state_attributes = (
+                {"source": "forecast"} if self.coordinator.serving_forecast else None
+            )
+
+    @callback
+    def _async_set_value(self, value: Any) -> None:
+        """Apply a value extracted by the value function."""
+        raise NotImplementedError
@@ -0,0 +1,75 @@
+"""Current conditions estimated from the hourly One Call block."""
+from bisect import bisect_right
+from typing import Any
+
+# Linearly interpolated fields, with the number of decimals the API uses
+INTERPOLATED_FIELDS = {
+    "temp": 2,
+    "feels_like": 2,
+    "pressure": 0,
+    "humidity": 0,
+    "dew_point": 2,
+    "uvi": 2,
+    "clouds": 0,
+    "visibility": 0,
+    "wind_speed": 2,
+    "wind_gust": 2,
+}
+# Fields describing a whole hour, taken from the hour containing the time
+HOURLY_FIELDS = ("weather", "rain", "snow")
+# Fields of the current block that do not change within the day
+KEPT_FIELDS = ("sunrise", "sunset")
+
+HOUR = 3600
+
+
+def forecast_current(data: dict[str, Any], timestamp: float) -> dict[str, Any] | None:
+    """Return a current block for a Unix timestamp, estimated from the hourly block.
+
+    Values between two forecast hours are interpolated linearly, wind
+    directions along the shorter arc. None is returned when the hourly block
+    does not cover the timestamp.
+    """
+    hourly = data.get("hourly") or []
+    times = [hour.get("dt") or 0 for hour in hourly]
+    index = bisect_right(times, timestamp) - 1
+    if index < 0 or timestamp >= times[-1] + HOUR:
+        return None
+
+    hour = hourly[index]
+    after = hourly[index + 1] if index + 1 < len(hourly) else hour
+    span = times[index + 1] - times[index] if after is not hour else 0
+    fraction = (timestamp - times[index]) / span if span > 0 else 0
+
+    current = {
+        key: value
+        for key in KEPT_FIELDS
+        if (value := (data.get("current") or {}).get(key)) is not None
+    }
+    current["dt"] = int(timestamp)
+    for key, decimals in INTERPOLATED_FIELDS.items():
+        value = _interpolate(hour.get(key), after.get(key), fraction)
+        if value is not None:
+            current[key] = round(value, decimals) if decimals else round(value)
+    wind_deg = _interpolate_angle(hour.get("wind_deg"), after.get("wind_deg"), fraction)
+    if wind_deg is not None:
+        current["wind_deg"] = round(wind_deg) % 360
+    for key in HOURLY_FIELDS:
+        if key in hour:
+            current[key] = hour[key]
+    return current
+
+
+def _interpolate(start: float | None, end: float | None, fraction: float) -> float | None:
+    if start is None or end is None:
+        return start if end is None else end
+    return start + (end - start) * fraction
+
+
+def _interpolate_angle(
+    start: float | None, end: float | None, fraction: float
+) -> float | None:
+    if start is None or end is None:
+        return start if end is None else end
+    delta = (end - start + 180) % 360 - 180
+    return start + delta * fraction
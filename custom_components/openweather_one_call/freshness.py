@@ -0,0 +1,92 @@
+"""Cadence of the current conditions published by OpenWeatherMap."""
+from collections import deque
+import math
+from typing import Any
+
+from .const import FRESHNESS_MARGIN, FRESHNESS_SAMPLES, MIN_UPDATE_INTERVAL
+
+# Shorter steps between current.dt values are not a publishing cadence
+MIN_CADENCE = 60
+
+
+class FreshnessTracker:
+    """Learn when a location's current conditions are updated.
+
+    Every payload carries the time its current conditions were calculated
+    in ``current.dt``. The smallest step between distinct values seen
+    recently is taken as the publishing cadence, as polls further apart
+    than it see multiples of it. A response repeating the last ``dt`` is
+    stale: it paid for a request without new current conditions.
+    """
+
+    def __init__(self):
+        self.last_dt: int | None = None
+        self.responses = 0
+        self.stale = 0
+        # Polls moved past an expected update that would have been stale
+        self.avoided = 0
+        self._steps: deque[int] = deque(maxlen=FRESHNESS_SAMPLES)
+
+    @property
+    def cadence(self) -> int | None:
+        """Return the estimated seconds between updates, None until known."""
+        return min(self._steps) if self._steps else None
+
+    def observe(self, data: dict[str, Any], count: bool = True) -> bool:
+        """Record the current.dt of a payload and return if it is stale.
+
+        Payloads restored from storage or handed over by the config flow
+        are observed without counting them as responses.
+        """
+        dt = (data.get("current") or {}).get("dt")
+        if dt is None:
+            return False
+        stale = dt == self.last_dt
+        if count:
+            self.responses += 1
+            self.stale += stale
+        if self.last_dt is not None and dt - self.last_dt >= MIN_CADENCE:
+            self._steps.append(dt - self.last_dt)
+        if self.last_dt is None or dt > self.last_dt:
+            self.last_dt = dt
+        return stale
+
+    def aligned_delay(self, now: float, due: float) -> float | None:
+        """Return the seconds until the poll nearest to due that follows an update.
+
+        Polls are placed FRESHNESS_MARGIN after an expected update, the one
+        closest to when the budget wants the next poll, so the average rate
+        stays the same. They never follow the last poll by less than
+        MIN_UPDATE_INTERVAL, and never come more than half a cadence after
+        the later of due and that minimum.
+
+        None means polling at due: the cadence is not known yet, or no
+        response was stale yet. A provider whose current.dt follows the
+        request time never repeats it, and aligning to steps learned from
+        the polls themselves would only stretch the interval every time.
+        """
+        if (cadence := self.cadence) is None or self.last_dt is None or not self.stale:
+            return None
+        updates = max(round((due - FRESHNESS_MARGIN - self.last_dt) / cadence), 1)
+        target = self.last_dt + updates * cadence + FRESHNESS_MARGIN
+        if target < now + MIN_UPDATE_INTERVAL:
+            target += math.ceil((now + MIN_UPDATE_INTERVAL - target) / cadence) * cadence
+        if target > max(due, now + MIN_UPDATE_INTERVAL) + cadence / 2:
+            return None
+        if due < self.last_dt + cadence + FRESHNESS_MARGIN:
+            self.avoided += 1
+        return target - now
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "cadence": self.cadence,
+            "last_dt": self.last_dt,
+            "responses": self.responses,
+            "stale": self.stale,
+            "stale_fraction": self.stale / self.responses if self.responses else None,
+            "stale_avoided": self.avoided,
+            # Of the polls that were or would have been stale
+            "avoided_fraction": self.avoided / (self.avoided + self.stale)
+            if self.avoided + self.stale
+            else None,
+        }
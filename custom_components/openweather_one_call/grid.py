@@ -0,0 +1,79 @@
+"""API clients shared by locations in the same grid cell."""
+import asyncio
+from collections.abc import Callable
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .budget import RequestBudget
+from .const import (
+    DATA_FETCH_SEMAPHORE,
+    DATA_GRID_CELLS,
+    GRID_CELL_DECIMALS,
+    MAX_CONCURRENT_FETCHES,
+)
+from .coordinator import OpenWeatherOneCallApi
+
+# Consecutive multiples of the golden ratio spread evenly over [0, 1) for any
+# number of cells
+_GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+
+class GridCell:
+    """API client and polling phase of the locations in one grid cell."""
+
+    def __init__(self, api: OpenWeatherOneCallApi, phase: float):
+        self.api = api
+        self.phase = phase
+        self.users = 0
+
+
+@callback
+def async_get_grid_cell(
+    hass: HomeAssistant,
+    api_key: str,
+    latitude: float,
+    longitude: float,
+    budget: RequestBudget,
+    session: aiohttp.ClientSession,
+) -> tuple[GridCell, Callable[[], None]]:
+    """Return the grid cell of a location and a callback to release it.
+
+    Locations with the same API key whose coordinates round to the same
+    cell, in one or several config entries, share an API client. With it
+    they share fetched payloads, the circuit breaker and the metrics. All
+    clients draw from one semaphore that bounds the requests in flight.
+    A shared client uses the session of the entry that acquired it last.
+    """
+    cells: dict[tuple, GridCell] = hass.data.setdefault(DATA_GRID_CELLS, {})
+    key = (
+        api_key,
+        round(latitude, GRID_CELL_DECIMALS),
+        round(longitude, GRID_CELL_DECIMALS),
+    )
+    if (cell := cells.get(key)) is None:
+        semaphore = hass.data.setdefault(
+            DATA_FETCH_SEMAPHORE, asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        )
+        api = OpenWeatherOneCallApi(
+            session,
+            api_key,
+            latitude,
+            longitude,
+            budget,
+            semaphore=semaphore,
+        )
+        phase = (len(cells) * _GOLDEN_RATIO_CONJUGATE) % 1
+        cell = cells[key] = GridCell(api, phase)
+    else:
+        cell.api.async_set_session(session)
+    cell.users += 1
+
+    @callback
+    def release() -> None:
+        cell.users -= 1
+        if not cell.users:
+            cells.pop(key, None)
+
+    return cell, release
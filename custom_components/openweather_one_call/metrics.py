@@ -0,0 +1,128 @@
+"""Runtime metrics of the One Call API client and coordinator."""
+from bisect import bisect_left
+from collections import Counter
+from typing import Any
+
+# Upper bounds in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DECODE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+class DurationHistogram:
+    """Count durations in fixed buckets."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the q-quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def as_dict(self) -> dict[str, Any]:
+        bounds = [f"le_{bound}" for bound in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "last": self.last,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
+class RequestTimings:
+    """Phases of a single request, set by the trace hooks of the transport.
+
+    Sessions without them leave every phase None.
+    """
+
+    __slots__ = ("dns", "connect", "headers_sent", "response_start", "reused")
+
+    def __init__(self):
+        self.dns: float | None = None
+        # New connections only, including the DNS lookup and TLS handshake
+        self.connect: float | None = None
+        self.headers_sent: float | None = None
+        self.response_start: float | None = None
+        self.reused = False
+
+
+class RequestMetrics:
+    """Counters kept by the API client."""
+
+    def __init__(self):
+        self.requests = 0
+        # Requests by endpoint path, such as 3.0/onecall
+        self.endpoints: Counter[str] = Counter()
+        self.retries = 0
+        # Fetches answered with a payload fetched for another location
+        self.shared = 0
+        self.errors: Counter[str] = Counter()
+        self.latency = DurationHistogram()
+        self.decode = DurationHistogram(DECODE_BUCKETS)
+        self.last_payload_bytes = 0
+        self.total_payload_bytes = 0
+        # Timings and sizes on the wire, see RequestTimings
+        self.dns = DurationHistogram()
+        self.connect = DurationHistogram()
+        self.ttfb = DurationHistogram()
+        self.transfer = DurationHistogram()
+        self.connections_reused = 0
+        self.compressed = 0
+        self.total_wire_bytes = 0
+
+    def observe_transfer(
+        self, timings: RequestTimings, end: float, wire_bytes: int, compressed: bool
+    ) -> None:
+        """Record the phases of a request whose body was read at end."""
+        if timings.dns is not None:
+            self.dns.observe(timings.dns)
+        if timings.connect is not None:
+            self.connect.observe(timings.connect)
+        self.connections_reused += timings.reused
+        if timings.headers_sent is not None and timings.response_start is not None:
+            self.ttfb.observe(timings.response_start - timings.headers_sent)
+            self.transfer.observe(end - timings.response_start)
+        self.compressed += compressed
+        self.total_wire_bytes += wire_bytes
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "endpoints": dict(self.endpoints),
+            "retries": self.retries,
+            "shared": self.shared,
+            "errors": dict(self.errors),
+            "latency": self.latency.as_dict(),
+            "decode": self.decode.as_dict(),
+            "last_payload_bytes": self.last_payload_bytes,
+            "total_payload_bytes": self.total_payload_bytes,
+            "transport": {
+                "dns": self.dns.as_dict(),
+                "connect": self.connect.as_dict(),
+                "ttfb": self.ttfb.as_dict(),
+                "transfer": self.transfer.as_dict(),
+                "connections_created": self.connect.count,
+                "connections_reused": self.connections_reused,
+                "compressed": self.compressed,
+                "total_wire_bytes": self.total_wire_bytes,
+            },
+        }
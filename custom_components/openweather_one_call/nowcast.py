@@ -0,0 +1,43 @@
+"""Precipitation nowcast from the minutely One Call block."""
+from typing import Any
+
+from .const import NOWCAST_RAIN_THRESHOLD
+from .snapshot import OneCallSnapshot
+
+NOWCAST_KEYS = (
+    "minutes_until_rain",
+    "minutes_until_dry",
+    "expected_precipitation",
+    "peak_precipitation_intensity",
+)
+
+
+def compute_nowcast(snapshot: OneCallSnapshot) -> dict[str, Any]:
+    """Compute every nowcast value in one pass over the minutely block.
+
+    The block holds one precipitation intensity in mm/h per minute for the
+    next hour. Minutes count from the first entry. When rain does not start
+    or stop within the block the respective value is None.
+    """
+    minutely = snapshot.data.get("minutely") or []
+    intensities = [minute.get("precipitation") or 0.0 for minute in minutely]
+    if not intensities:
+        return dict.fromkeys(NOWCAST_KEYS)
+
+    raining_now = intensities[0] >= NOWCAST_RAIN_THRESHOLD
+    change_at = None
+    total = peak = 0.0
+    for minute, intensity in enumerate(intensities):
+        total += intensity
+        if intensity > peak:
+            peak = intensity
+        if change_at is None and (intensity >= NOWCAST_RAIN_THRESHOLD) != raining_now:
+            change_at = minute
+
+    return {
+        "minutes_until_rain": 0 if raining_now else change_at,
+        "minutes_until_dry": change_at if raining_now else 0,
+        # Each entry is an hourly rate that lasts one minute
+        "expected_precipitation": round(total / 60, 2),
+        "peak_precipitation_intensity": peak,
+    }
@@ -1,17 +1,26 @@
-from datetime import datetime, timezone
+from collections.abc import Callable
+from functools import partial
+from operator import attrgetter
+from typing import Any
+
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 from homeassistant.const import (
+    CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
     DEGREE,
+    UnitOfInformation,
     UnitOfLength,
+    UnitOfTime,
+    UnitOfPrecipitationDepth,
+    UnitOfVolumetricFlux,
     PERCENTAGE,
     UnitOfPressure,
     UnitOfSpeed,
@@ -19,192 +28,422 @@ from homeassistant.const import (
     UV_INDEX,
 )
 
-from .const import DOMAIN, CONF_NAME
+from .const import (
+    DOMAIN,
+    BLOCK_AIR_POLLUTION,
+    BLOCK_AIR_POLLUTION_FORECAST,
+    BLOCK_ALERTS,
+    BLOCK_CURRENT,
+    BLOCK_DAILY,
+    BLOCK_HOURLY,
+    BLOCK_MINUTELY,
+    DATA_HORIZONS,
+    METRICS_CONTEXT,
+)
+from .air_pollution import compute_air_pollution_forecast
+from .alerts import alert_index, alert_summary
 from .coordinator import OpenWeatherOneCallCoordinator
+from .entity import OpenWeatherOneCallEntity
+from .derived import compute_derived
+from .nowcast import compute_nowcast
+from .snapshot import ValueFn, as_local_time, as_utc_datetime, compile_path
 
 SENSOR_TYPES = {
-    "current.temp": {"description": "Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "current.feels_like": {"description": "Feels Like Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "current.pressure": {"description": "Pressure", "device_class": SensorDeviceClass.PRESSURE, "unit": UnitOfPressure.HPA, "state_class": SensorStateClass.MEASUREMENT},
+    "current.temp": {"description": "Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "current.feels_like": {"description": "Feels Like Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "current.pressure": {"description": "Pressure", "device_class": SensorDeviceClass.PRESSURE, "unit": UnitOfPressure.HPA, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 1},
     "current.humidity": {"description": "Humidity", "device_class": SensorDeviceClass.HUMIDITY, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT},
-    "current.dew_point": {"description": "Dew Point", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
+    "current.dew_point": {"description": "Dew Point", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
     "current.clouds": {"description": "Cloudiness", "device_class": None, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT},
-    "current.uvi": {"description": "UV Index", "device_class": None, "unit": UV_INDEX, "state_class": SensorStateClass.MEASUREMENT},
-    "current.visibility": {"description": "Visibility", "device_class": None, "unit": UnitOfLength.METERS, "state_class": SensorStateClass.MEASUREMENT},
-    "current.wind_speed": {"description": "Wind Speed", "device_class": None, "unit": UnitOfSpeed.METERS_PER_SECOND, "state_class": SensorStateClass.MEASUREMENT},
-    "current.wind_deg": {"description": "Wind Degree", "device_class": None, "unit": DEGREE, "state_class": SensorStateClass.MEASUREMENT},
-    "current.wind_gust": {"description": "Wind Gust", "device_class": None, "unit": UnitOfSpeed.METERS_PER_SECOND, "state_class": SensorStateClass.MEASUREMENT},
+    "current.uvi": {"description": "UV Index", "device_class": None, "unit": UV_INDEX, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "current.visibility": {"description": "Visibility", "device_class": None, "unit": UnitOfLength.METERS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 100},
+    "current.wind_speed": {"description": "Wind Speed", "device_class": None, "unit": UnitOfSpeed.METERS_PER_SECOND, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "current.wind_deg": {"description": "Wind Degree", "device_class": None, "unit": DEGREE, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 5},
+    "current.wind_gust": {"description": "Wind Gust", "device_class": None, "unit": UnitOfSpeed.METERS_PER_SECOND, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
     "current.rain.1h": {"description": "Rain (last 1h)", "device_class": SensorDeviceClass.PRECIPITATION, "unit": "mm/h", "state_class": SensorStateClass.MEASUREMENT}, # Using custom unit string
     "current.snow.1h": {"description": "Snow (last 1h)", "device_class": SensorDeviceClass.PRECIPITATION, "unit": "mm/h", "state_class": SensorStateClass.MEASUREMENT}, # Using custom unit string
     "current.weather.0.main": {"description": "Weather Condition", "device_class": None, "unit": None, "state_class": None},
     "current.weather.0.description": {"description": "Weather Description", "device_class": None, "unit": None, "state_class": None},
     
     # Daily forecast sensors (keys within the daily object)
-    "temp.day": {"description": "Daytime Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "temp.min": {"description": "Minimum Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "temp.max": {"description": "Maximum Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "temp.night": {"description": "Nighttime Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "temp.eve": {"description": "Evening Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "temp.morn": {"description": "Morning Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT},
-    "pop": {"description": "Probability of Precipitation", "device_class": None, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT},
+    "temp.day": {"description": "Daytime Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "temp.min": {"description": "Minimum Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "temp.max": {"description": "Maximum Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "temp.night": {"description": "Nighttime Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "temp.eve": {"description": "Evening Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "temp.morn": {"description": "Morning Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "pop": {"description": "Probability of Precipitation", "device_class": None, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 1},
     "sunrise": {"description": "Sunrise", "device_class": SensorDeviceClass.TIMESTAMP, "unit": None, "state_class": None},
     "sunset": {"description": "Sunset", "device_class": SensorDeviceClass.TIMESTAMP, "unit": None, "state_class": None},
     "sunrise_time": {"description": "Sunrise Time", "device_class": None, "unit": None, "state_class": None},
     "sunset_time": {"description": "Sunset Time", "device_class": None, "unit": None, "state_class": None},
 }
 
+# Hourly forecast sensors (keys within the hourly objects), disabled by default
+# and only created up to the hourly horizon
+HOURLY_SENSOR_TYPES = {
+    "temp": {"description": "Temperature", "device_class": SensorDeviceClass.TEMPERATURE, "unit": UnitOfTemperature.CELSIUS, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "pop": {"description": "Probability of Precipitation", "device_class": None, "unit": PERCENTAGE, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 1},
+    "rain.1h": {"description": "Rain", "device_class": SensorDeviceClass.PRECIPITATION, "unit": UnitOfPrecipitationDepth.MILLIMETERS, "state_class": SensorStateClass.MEASUREMENT},
+    "wind_speed": {"description": "Wind Speed", "device_class": None, "unit": UnitOfSpeed.METERS_PER_SECOND, "state_class": SensorStateClass.MEASUREMENT, "significant_change": 0.1},
+    "weather.0.main": {"description": "Weather Condition", "device_class": None, "unit": None, "state_class": None},
+}
+
+# Daily forecast sensors of today and tomorrow are enabled by default, later
+# days are registered disabled
+DAILY_SENSOR_KEYS = (
+    "temp.day", "temp.min", "temp.max", "temp.night", "temp.eve", "temp.morn", "pop",
+    "sunrise", "sunset", "sunrise_time", "sunset_time"
+)
+DAILY_ENABLED_DAYS = 2
+
+# Nowcast sensors computed from the minutely block, disabled by default so the
+# block is only requested for those who use them
+NOWCAST_SENSOR_TYPES = {
+    "minutes_until_rain": {"description": "Minutes Until Rain", "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.MINUTES, "state_class": None},
+    "minutes_until_dry": {"description": "Minutes Until Dry", "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.MINUTES, "state_class": None},
+    "expected_precipitation": {"description": "Expected Precipitation Next Hour", "device_class": SensorDeviceClass.PRECIPITATION, "unit": UnitOfPrecipitationDepth.MILLIMETERS, "state_class": SensorStateClass.MEASUREMENT},
+    "peak_precipitation_intensity": {"description": "Peak Precipitation Intensity Next Hour", "device_class": SensorDeviceClass.PRECIPITATION_INTENSITY, "unit": UnitOfVolumetricFlux.MILLIMETERS_PER_HOUR, "state_class": SensorStateClass.MEASUREMENT},
+}
+
+# Aggregates over the forecast blocks, computed once per update for all of
+# them and disabled by default
+DERIVED_SENSOR_TYPES = {
+    "precipitation_next_24h": {"description": "Precipitation Next 24 Hours", "block": BLOCK_HOURLY, "device_class": SensorDeviceClass.PRECIPITATION, "unit": UnitOfPrecipitationDepth.MILLIMETERS, "state_class": SensorStateClass.MEASUREMENT},
+    "max_gust_next_24h": {"description": "Maximum Wind Gust Next 24 Hours", "block": BLOCK_HOURLY, "device_class": None, "unit": UnitOfSpeed.METERS_PER_SECOND, "state_class": SensorStateClass.MEASUREMENT},
+    "frost_hours_next_24h": {"description": "Frost Hours Next 24 Hours", "block": BLOCK_HOURLY, "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.HOURS, "state_class": SensorStateClass.MEASUREMENT},
+    "dry_window_start": {"description": "Dry Window Start", "block": BLOCK_HOURLY, "device_class": SensorDeviceClass.TIMESTAMP, "unit": None, "state_class": None},
+    "dry_window_hours": {"description": "Dry Window Length", "block": BLOCK_HOURLY, "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.HOURS, "state_class": SensorStateClass.MEASUREMENT},
+    "heating_degree_days": {"description": "Heating Degree Days", "block": BLOCK_DAILY, "device_class": None, "unit": "°C·d", "state_class": SensorStateClass.MEASUREMENT},
+    "cooling_degree_days": {"description": "Cooling Degree Days", "block": BLOCK_DAILY, "device_class": None, "unit": "°C·d", "state_class": SensorStateClass.MEASUREMENT},
+}
+
+# Air pollution sensors (keys within the air pollution entry), disabled by
+# default so the air pollution endpoint is only polled for those who use them.
+# The index runs from 1 (good) to 5 (very poor).
+AIR_POLLUTION_SENSOR_TYPES = {
+    "air_pollution.main.aqi": {"description": "Air Quality Index", "device_class": SensorDeviceClass.AQI, "unit": None, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.pm2_5": {"description": "PM2.5", "device_class": SensorDeviceClass.PM25, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.pm10": {"description": "PM10", "device_class": SensorDeviceClass.PM10, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.o3": {"description": "Ozone", "device_class": SensorDeviceClass.OZONE, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.no2": {"description": "Nitrogen Dioxide", "device_class": SensorDeviceClass.NITROGEN_DIOXIDE, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.no": {"description": "Nitrogen Monoxide", "device_class": SensorDeviceClass.NITROGEN_MONOXIDE, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.so2": {"description": "Sulphur Dioxide", "device_class": SensorDeviceClass.SULPHUR_DIOXIDE, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    # The carbon monoxide device class is in ppm, the API reports µg/m³
+    "air_pollution.components.co": {"description": "Carbon Monoxide", "device_class": None, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "air_pollution.components.nh3": {"description": "Ammonia", "device_class": None, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+}
+
+# Maxima over the air pollution forecast, computed once per update for all of
+# them and disabled by default
+AIR_POLLUTION_FORECAST_SENSOR_TYPES = {
+    "air_quality_index_max_next_24h": {"description": "Maximum Air Quality Index Next 24 Hours", "device_class": SensorDeviceClass.AQI, "unit": None, "state_class": SensorStateClass.MEASUREMENT},
+    "pm2_5_max_next_24h": {"description": "Maximum PM2.5 Next 24 Hours", "device_class": SensorDeviceClass.PM25, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "pm10_max_next_24h": {"description": "Maximum PM10 Next 24 Hours", "device_class": SensorDeviceClass.PM10, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+    "o3_max_next_24h": {"description": "Maximum Ozone Next 24 Hours", "device_class": SensorDeviceClass.OZONE, "unit": CONCENTRATION_MICROGRAMS_PER_CUBIC_METER, "state_class": SensorStateClass.MEASUREMENT},
+}
+
+# Diagnostic sensors reading the runtime metrics of the coordinator, disabled by default
+METRIC_SENSOR_TYPES = {
+    "requests_today": {"description": "Requests Today", "device_class": None, "unit": None, "state_class": SensorStateClass.TOTAL_INCREASING},
+    "request_latency": {"description": "Request Latency", "device_class": SensorDeviceClass.DURATION, "unit": UnitOfTime.MILLISECONDS, "state_class": SensorStateClass.MEASUREMENT},
+    "payload_size": {"description": "Payload Size", "device_class": SensorDeviceClass.DATA_SIZE, "unit": UnitOfInformation.BYTES, "state_class": SensorStateClass.MEASUREMENT},
+    "request_errors": {"description": "Request Errors", "device_class": None, "unit": None, "state_class": SensorStateClass.TOTAL_INCREASING},
+    "last_successful_fetch": {"description": "Last Successful Fetch", "device_class": SensorDeviceClass.TIMESTAMP, "unit": None, "state_class": None},
+}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the sensor platform."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]
-    
+    """Set up the sensor platform.
+
+    Sensors whose registry entry is disabled are not created at all, so
+    setup time and memory follow the enabled sensors rather than the
+    forecast horizon. Home Assistant reloads the entry when one is enabled.
+    Registry entries of sensors that are no longer provided, such as days
+    beyond a reduced horizon, are removed.
+    """
+    registry = er.async_get(hass)
+    registered = {
+        registry_entry.unique_id: registry_entry
+        for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id)
+        if registry_entry.domain == "sensor"
+    }
+    disabled = {
+        unique_id
+        for unique_id, registry_entry in registered.items()
+        if registry_entry.disabled
+    }
+    daily_horizon, hourly_horizon = hass.data[DATA_HORIZONS][entry.entry_id]
+
     entities = []
-    
+    provided = set()
+    for coordinator in hass.data[DOMAIN][entry.entry_id]:
+        for unique_id, create in _location_sensors(
+            coordinator, entry, daily_horizon, hourly_horizon
+        ):
+            provided.add(unique_id)
+            if unique_id not in disabled:
+                entities.append(create())
+
+    for unique_id in registered.keys() - provided:
+        registry.async_remove(registered[unique_id].entity_id)
+
+    async_add_entities(entities)
+
+
+def _location_sensors(
+    coordinator: OpenWeatherOneCallCoordinator,
+    entry: ConfigEntry,
+    daily_horizon: int,
+    hourly_horizon: int,
+) -> list[tuple[str, Callable[[], SensorEntity]]]:
+    """Return the sensors of one location as unique ids with factories."""
+    entities = []
+
+    def add(entity_class: type[SensorEntity], sensor_type: str, **kwargs: Any) -> None:
+        entities.append(
+            (
+                f"{coordinator.location_id}_{sensor_type}",
+                partial(entity_class, coordinator, entry, sensor_type, **kwargs),
+            )
+        )
+
     # --- Create sensors for CURRENT conditions ---
     for sensor_type_key, sensor_config in SENSOR_TYPES.items():
         if sensor_type_key.startswith("current."):
-            entities.append(
-                OpenWeatherOneCallSensor(
-                    coordinator,
-                    entry,
-                    sensor_type=sensor_type_key,
-                    device_class=sensor_config.get("device_class"),
-                    state_class=sensor_config.get("state_class"),
-                    unit=sensor_config.get("unit"),
-                )
+            add(
+                OpenWeatherOneCallSensor,
+                sensor_type_key,
+                value_fn=_compile_value(sensor_type_key, sensor_config),
+                block=BLOCK_CURRENT,
+                device_class=sensor_config.get("device_class"),
+                state_class=sensor_config.get("state_class"),
+                unit=sensor_config.get("unit"),
+                significant_change=sensor_config.get("significant_change"),
+                forecast_fallback=True,
             )
 
-    # --- Create sensors for DAILY forecasts (Today and Tomorrow) ---
-    daily_sensor_keys_to_create = [
-        "temp.day", "temp.min", "temp.max", "temp.night", "temp.eve", "temp.morn", "pop",
-        "sunrise", "sunset", "sunrise_time", "sunset_time"
-    ]
-
-    for day_index in range(2):  # 0 for today, 1 for tomorrow
-        for base_key in daily_sensor_keys_to_create:
-            if base_key not in SENSOR_TYPES:
-                continue
-
-            # Determine the actual data source key from the base key
-            data_source_key = base_key.replace("_time", "") if base_key.endswith("_time") else base_key
-
+    # --- Create sensors for DAILY forecasts (Today, Tomorrow and later days) ---
+    for day_index in range(daily_horizon):  # 0 for today, 1 for tomorrow
+        for base_key in DAILY_SENSOR_KEYS:
             # Create a unique sensor_type for the entity's unique_id and translation_key
             unique_sensor_type = f"daily_{day_index}_{base_key.replace('.', '_')}"
             sensor_config = SENSOR_TYPES[base_key]
+            enabled = day_index < DAILY_ENABLED_DAYS
+
+            add(
+                OpenWeatherOneCallSensor,
+                unique_sensor_type,
+                value_fn=_compile_value(base_key, sensor_config, day_index),
+                block=BLOCK_DAILY,
+                device_class=sensor_config.get("device_class"),
+                state_class=sensor_config.get("state_class"),
+                unit=sensor_config.get("unit"),
+                significant_change=sensor_config.get("significant_change"),
+                # Later days have no translations
+                name=None if enabled else f"In {day_index} Days {sensor_config['description']}",
+                enabled_default=enabled,
+            )
 
-            entities.append(
-                OpenWeatherOneCallSensor(
-                    coordinator,
-                    entry,
-                    sensor_type=unique_sensor_type,
-                    source_key=data_source_key,
-                    forecast_day=day_index,
-                    device_class=sensor_config.get("device_class"),
-                    state_class=sensor_config.get("state_class"),
-                    unit=sensor_config.get("unit"),
-                )
+    # --- Create sensors for HOURLY forecasts ---
+    for hour in range(1, hourly_horizon + 1):
+        for base_key, sensor_config in HOURLY_SENSOR_TYPES.items():
+            add(
+                OpenWeatherOneCallSensor,
+                f"hourly_{hour}_{base_key.replace('.', '_')}",
+                value_fn=_compile_value(base_key, sensor_config, hour, BLOCK_HOURLY),
+                block=BLOCK_HOURLY,
+                device_class=sensor_config.get("device_class"),
+                state_class=sensor_config.get("state_class"),
+                unit=sensor_config.get("unit"),
+                significant_change=sensor_config.get("significant_change"),
+                name=f"In {hour} Hours {sensor_config['description']}",
+                enabled_default=False,
             )
 
     # --- Create weather alert sensor ---
     entities.append(
-        OpenWeatherOneCallAlertSensor(
-            coordinator=coordinator,
-            config_entry=entry,
+        (
+            f"{coordinator.location_id}_weather_alert",
+            partial(OpenWeatherOneCallAlertSensor, coordinator, entry),
         )
     )
 
-    async_add_entities(entities)
+    # --- Create nowcast sensors ---
+    for nowcast_key, nowcast_config in NOWCAST_SENSOR_TYPES.items():
+        add(
+            OpenWeatherOneCallNowcastSensor,
+            nowcast_key,
+            value_fn=_nowcast_value(nowcast_key),
+            block=BLOCK_MINUTELY,
+            device_class=nowcast_config.get("device_class"),
+            state_class=nowcast_config.get("state_class"),
+            unit=nowcast_config.get("unit"),
+        )
 
+    # --- Create derived forecast sensors ---
+    for derived_key, derived_config in DERIVED_SENSOR_TYPES.items():
+        add(
+            OpenWeatherOneCallSensor,
+            derived_key,
+            value_fn=_derived_value(derived_key),
+            block=derived_config["block"],
+            device_class=derived_config.get("device_class"),
+            state_class=derived_config.get("state_class"),
+            unit=derived_config.get("unit"),
+            enabled_default=False,
+        )
 
-class OpenWeatherOneCallSensor(CoordinatorEntity, SensorEntity):
-    """Representation of a Sensor."""
+    # --- Create air pollution sensors ---
+    for air_key, air_config in AIR_POLLUTION_SENSOR_TYPES.items():
+        add(
+            OpenWeatherOneCallSensor,
+            air_key,
+            value_fn=_compile_value(air_key, air_config),
+            block=BLOCK_AIR_POLLUTION,
+            device_class=air_config.get("device_class"),
+            state_class=air_config.get("state_class"),
+            unit=air_config.get("unit"),
+            enabled_default=False,
+        )
+    for air_key, air_config in AIR_POLLUTION_FORECAST_SENSOR_TYPES.items():
+        add(
+            OpenWeatherOneCallSensor,
+            air_key,
+            value_fn=_air_pollution_forecast_value(air_key),
+            block=BLOCK_AIR_POLLUTION_FORECAST,
+            device_class=air_config.get("device_class"),
+            state_class=air_config.get("state_class"),
+            unit=air_config.get("unit"),
+            enabled_default=False,
+        )
+
+    # --- Create diagnostic sensors ---
+    for metric_key, metric_config in METRIC_SENSOR_TYPES.items():
+        add(
+            OpenWeatherOneCallMetricSensor,
+            metric_key,
+            device_class=metric_config.get("device_class"),
+            state_class=metric_config.get("state_class"),
+            unit=metric_config.get("unit"),
+        )
+
+    return entities
+
+
+def _compile_value(
+    base_key: str,
+    sensor_config: dict,
+    forecast_index: int | None = None,
+    block: str = BLOCK_DAILY,
+) -> ValueFn:
+    """Compile a sensor type into a function reading its value from a snapshot.
+
+    With a forecast index the key is looked up in that entry of the daily or
+    hourly block.
+    """
+    # The *_time sensors format the timestamp found under their base key
+    lookup = compile_path(base_key.removesuffix("_time"))
+
+    if forecast_index is None:
+        def get(snapshot):
+            return lookup(snapshot.data)
+    else:
+        forecast = attrgetter(block)
+
+        def get(snapshot):
+            entries = forecast(snapshot)
+            return lookup(entries[forecast_index]) if len(entries) > forecast_index else None
+
+    if base_key.endswith("_time"):
+        return lambda snapshot: as_local_time(get(snapshot))
+    if base_key == "pop":
+        return lambda snapshot: None if (value := get(snapshot)) is None else value * 100
+    if sensor_config.get("device_class") == SensorDeviceClass.TIMESTAMP:
+        return lambda snapshot: as_utc_datetime(get(snapshot))
+    return get
 
-    _attr_has_entity_name = True
+
+class OpenWeatherOneCallSensor(OpenWeatherOneCallEntity, SensorEntity):
+    """Representation of a Sensor."""
 
     def __init__(
         self,
         coordinator: OpenWeatherOneCallCoordinator,
         config_entry: ConfigEntry,
         sensor_type: str,
+        value_fn: ValueFn,
+        block: str,
         device_class: SensorDeviceClass | None = None,
         state_class: SensorStateClass | None = None,
         unit: str | None = None,
-        forecast_day: int | None = None,
-        source_key: str | None = None,
+        significant_change: float | None = None,
+        forecast_fallback: bool = False,
+        name: str | None = None,
+        enabled_default: bool = True,
     ):
         """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator)
-        self.config_entry = config_entry
+        super().__init__(coordinator, config_entry, sensor_type, value_fn)
         self._sensor_type = sensor_type
-        self._source_key = source_key
+        self._significant_change = significant_change
+        self._forecast_fallback = forecast_fallback
+        self._required_blocks = (block,)
         self._attr_device_class = device_class
         self._attr_state_class = state_class
         self._attr_native_unit_of_measurement = unit
         self._attr_translation_key = sensor_type.replace(".", "_")
-        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_type}"
-        self._forecast_day = forecast_day
+        self._attr_unique_id = f"{self._location_id}_{sensor_type}"
+        if name is not None:
+            self._attr_name = name
+        if not enabled_default:
+            self._attr_entity_registry_enabled_default = False
 
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        # Use source_key for data lookup if provided, otherwise default to sensor_type
-        lookup_key = self._source_key or self._sensor_type
-
-        data = self.coordinator.data
-        if data is None:
-            return None
-
-        if self._forecast_day is not None:
-            if "daily" not in data or len(data["daily"]) <= self._forecast_day:
-                return None
-            data = data["daily"][self._forecast_day]
-
-        keys = lookup_key.split(".")
-        value = data
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key)
-            elif isinstance(value, list) and key.isdigit() and len(value) > int(key):
-                value = value[int(key)]
-            else:
-                value = None
-                break
-        
-        # Format value for specific sensor types based on the unique sensor_type
-        if self._sensor_type.endswith(("_sunrise_time", "_sunset_time")):
-            if value is not None:
-                utc_dt = datetime.fromtimestamp(value, tz=timezone.utc)
-                local_dt = dt_util.as_local(utc_dt)
-                return local_dt.strftime("%H:%M")
-            return None
-
-        # The check for 'pop' needs to be against the source_key
-        if self._source_key == "pop" and value is not None:
-            return value * 100
-
-        if self.device_class == SensorDeviceClass.TIMESTAMP and value is not None:
-            return datetime.fromtimestamp(value, tz=timezone.utc)
-            
-        return value
+    @callback
+    def _async_set_value(self, value) -> None:
+        self._attr_native_value = value
+
+
+def _nowcast_value(key: str) -> ValueFn:
+    """Return a function reading one value of the nowcast of a snapshot.
+
+    The nowcast is computed once per snapshot for all nowcast sensors.
+    """
+    return lambda snapshot: snapshot.cached("nowcast", compute_nowcast)[key]
+
+
+def _derived_value(key: str) -> ValueFn:
+    """Return a function reading one forecast aggregate of a snapshot.
+
+    The aggregates are computed once per snapshot for all derived sensors.
+    """
+    return lambda snapshot: snapshot.cached("derived", compute_derived)[key]
+
+
+def _air_pollution_forecast_value(key: str) -> ValueFn:
+    """Return a function reading one maximum of the air pollution forecast.
+
+    The maxima are computed once per snapshot for all forecast sensors.
+    """
+    return lambda snapshot: snapshot.cached(
+        "air_pollution_forecast", compute_air_pollution_forecast
+    )[key]
 
-    @property
-    def device_info(self):
-        """Link this entity to the device registry."""
-        return {
-            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
-            "name": self.config_entry.data[CONF_NAME],
-            "manufacturer": "Lomion-tm",
-            "model": "One Call API 3.0",
-        }
 
+class OpenWeatherOneCallNowcastSensor(OpenWeatherOneCallSensor):
+    """Precipitation nowcast sensor, disabled by default."""
 
-class OpenWeatherOneCallAlertSensor(CoordinatorEntity, SensorEntity):
+    _attr_entity_registry_enabled_default = False
+
+
+class OpenWeatherOneCallAlertSensor(OpenWeatherOneCallEntity, SensorEntity):
     """Representation of a Weather Alert Sensor."""
 
-    _attr_has_entity_name = True
+    _required_blocks = (BLOCK_ALERTS,)
+    # The descriptions run to kilobytes and are repeated with every change
+    _unrecorded_attributes = frozenset({"description", "alerts"})
 
     def __init__(
         self,
@@ -212,37 +451,114 @@ class OpenWeatherOneCallAlertSensor(CoordinatorEntity, SensorEntity):
         config_entry: ConfigEntry,
     ):
         """Pass coordinator to CoordinatorEntity."""
-        super().__init__(coordinator)
-        self.config_entry = config_entry
+        super().__init__(coordinator, config_entry, "weather_alert", _alert_value)
         self._attr_translation_key = "weather_alert"
-        self._attr_unique_id = f"{config_entry.entry_id}_weather_alert"
+        self._attr_unique_id = f"{self._location_id}_weather_alert"
 
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if self.coordinator.data and self.coordinator.data.get("alerts"):
-            return self.coordinator.data["alerts"][0].get("event")
-        return "No active alerts"
+    @callback
+    def _async_set_value(self, value) -> None:
+        self._attr_native_value, self._attr_extra_state_attributes = value or (
+            "No active alerts",
+            None,
+        )
 
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        if self.coordinator.data and self.coordinator.data.get("alerts"):
-            alert = self.coordinator.data["alerts"][0]
-            return {
-                "sender_name": alert.get("sender_name"),
-                "start": alert.get("start"),
-                "end": alert.get("end"),
-                "description": alert.get("description"),
-            }
+
+def _alert_value(snapshot):
+    """Return the state and attributes of the alert sensor."""
+    if not (alerts := alert_index(snapshot)):
         return None
+    alert = next(iter(alerts.values()))
+    return alert.get("event"), {
+        "sender_name": alert.get("sender_name"),
+        "start": alert.get("start"),
+        "end": alert.get("end"),
+        "description": alert.get("description"),
+        # Every concurrent alert, without the descriptions
+        "alerts": [alert_summary(key, alert) for key, alert in alerts.items()],
+    }
+
+
+class OpenWeatherOneCallMetricSensor(OpenWeatherOneCallEntity, SensorEntity):
+    """Diagnostic sensor showing a runtime metric of the coordinator."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # Derived from the state or from other metrics
+    _unrecorded_attributes = frozenset(
+        {"remaining", "p50_ms", "p95_ms", "requests", "total_bytes"}
+    )
+
+    def __init__(
+        self,
+        coordinator: OpenWeatherOneCallCoordinator,
+        config_entry: ConfigEntry,
+        metric: str,
+        device_class: SensorDeviceClass | None = None,
+        state_class: SensorStateClass | None = None,
+        unit: str | None = None,
+    ):
+        """Pass coordinator to CoordinatorEntity."""
+        super().__init__(coordinator, config_entry, METRICS_CONTEXT, None)
+        self._metric = metric
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_translation_key = metric
+        self._attr_unique_id = f"{self._location_id}_{metric}"
 
     @property
-    def device_info(self):
-        """Link this entity to the device registry."""
-        return {
-            "identifiers": {(DOMAIN, self.config_entry.entry_id)},
-            "name": self.config_entry.data[CONF_NAME],
-            "manufacturer": "Lomion-tm",
-            "model": "One Call API 3.0",
-        }
+    def available(self) -> bool:
+        """Metrics are most useful while the API is failing."""
+        return True
+
+    @callback
+    def _update_from_snapshot(self) -> None:
+        self._attr_native_value, self._attr_extra_state_attributes = _METRIC_VALUES[
+            self._metric
+        ](self.coordinator)
+
+
+def _requests_today_value(coordinator):
+    if (budget := coordinator.api.budget) is None:
+        return None, None
+    return budget.used, {"limit": budget.limit, "remaining": budget.remaining}
+
+
+def _request_latency_value(coordinator):
+    latency = coordinator.api.metrics.latency
+    if latency.last is None:
+        return None, None
+    return round(latency.last * 1000, 1), {
+        "p50_ms": latency.quantile(0.5) * 1000,
+        "p95_ms": latency.quantile(0.95) * 1000,
+        "requests": latency.count,
+    }
+
+
+def _payload_size_value(coordinator):
+    metrics = coordinator.api.metrics
+    if not metrics.last_payload_bytes:
+        return None, None
+    return metrics.last_payload_bytes, {"total_bytes": metrics.total_payload_bytes}
+
+
+def _request_errors_value(coordinator):
+    metrics = coordinator.api.metrics
+    return sum(metrics.errors.values()), {
+        **metrics.errors,
+        "retries": metrics.retries,
+        "last_error": coordinator.last_error,
+    }
+
+
+def _last_successful_fetch_value(coordinator):
+    return coordinator.last_fetch, None
+
+
+_METRIC_VALUES = {
+    "requests_today": _requests_today_value,
+    "request_latency": _request_latency_value,
+    "payload_size": _payload_size_value,
+    "request_errors": _request_errors_value,
+    "last_successful_fetch": _last_successful_fetch_value,
+}
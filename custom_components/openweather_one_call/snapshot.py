@@ -0,0 +1,124 @@
+"""Normalized per-update view of One Call payloads."""
+from collections.abc import Callable
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+ValueFn = Callable[["OneCallSnapshot"], Any]
+
+# Absorbs float rounding, so a step of exactly the significant change counts
+_CHANGE_TOLERANCE = 1e-9
+
+
+class OneCallSnapshot:
+    """A One Call payload with every registered entity value extracted once.
+
+    Entities read their value from ``values`` instead of walking the payload
+    on every state read. Larger derived data that is only needed on demand,
+    such as forecast lists, is built through ``cached`` at most once.
+    """
+
+    __slots__ = ("data", "current", "hourly", "daily", "values", "_cache")
+
+    data: dict[str, Any]
+    current: dict[str, Any]
+    hourly: list[dict[str, Any]]
+    daily: list[dict[str, Any]]
+    values: dict[str, Any]
+    _cache: dict[str, Any]
+
+    def __init__(self, data: dict[str, Any], value_fns: dict[str, ValueFn]):
+        self.data = data
+        self.current = data.get("current") or {}
+        self.hourly = data.get("hourly") or []
+        self.daily = data.get("daily") or []
+        self._cache = {}
+        self.values = {key: value_fn(self) for key, value_fn in value_fns.items()}
+
+    def cached(self, key: str, build: ValueFn) -> Any:
+        """Return build(self), computed on first use and kept for this payload."""
+        if key not in self._cache:
+            self._cache[key] = build(self)
+        return self._cache[key]
+
+    def changed_keys(
+        self,
+        previous: "OneCallSnapshot | None",
+        significant_changes: dict[str, float] | None = None,
+    ) -> set[str] | None:
+        """Return the value keys that differ from a previous snapshot.
+
+        None means everything changed, as there is nothing to compare with.
+        A numeric value that moved less than its significant change keeps
+        the previous value, so small steps cannot add up unnoticed. A step of
+        exactly the significant change, such as 12.3 to 12.4 for 0.1, counts.
+        """
+        if previous is None:
+            return None
+        old = previous.values
+        significant_changes = significant_changes or {}
+        changed = set()
+        for key, value in self.values.items():
+            if key not in old:
+                changed.add(key)
+            elif (old_value := old[key]) != value:
+                if (threshold := significant_changes.get(key)) is not None and (
+                    _is_number(value)
+                    and _is_number(old_value)
+                    and abs(value - old_value) < threshold - _CHANGE_TOLERANCE
+                ):
+                    self.values[key] = old_value
+                else:
+                    changed.add(key)
+        return changed
+
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """Compile a dotted lookup path such as ``current.weather.0.main``.
+
+    Numeric parts index into lists, all other parts are dictionary keys. A
+    missing key, short list or unexpected type yields None.
+    """
+    steps = tuple(int(key) if key.isdigit() else key for key in path.split("."))
+
+    def lookup(value: Any) -> Any:
+        try:
+            for step in steps:
+                value = value[step]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return value
+
+    return lookup
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def as_utc_datetime(value: Any) -> datetime | None:
+    """Convert a Unix timestamp from the payload to an aware UTC datetime."""
+    if value is None:
+        return None
+    return _utc_datetime(value)
+
+
+def as_local_time(value: Any) -> str | None:
+    """Convert a Unix timestamp from the payload to a local HH:MM string."""
+    if value is None:
+        return None
+    return _local_time(value, dt_util.DEFAULT_TIME_ZONE)
+
+
+# Sun times and forecast timestamps repeat across polls, so each distinct
+# value is only converted once.
+@lru_cache(maxsize=64)
+def _utc_datetime(value: int) -> datetime:
+    return dt_util.utc_from_timestamp(value)
+
+
+@lru_cache(maxsize=64)
+def _local_time(value: int, time_zone: tzinfo) -> str:
+    return _utc_datetime(value).astimezone(time_zone).strftime("%H:%M")
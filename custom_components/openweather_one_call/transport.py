@@ -0,0 +1,113 @@
+"""Dedicated HTTP transport for One Call requests."""
+import time
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp.hdrs import USER_AGENT
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_get_clientsession
+from homeassistant.util import ssl as ssl_util
+
+from .const import (
+    DATA_TRANSPORT,
+    TRANSPORT_DNS_TTL,
+    TRANSPORT_KEEPALIVE,
+    TRANSPORT_LIMIT_PER_HOST,
+)
+from .metrics import RequestTimings
+
+
+@callback
+def async_get_session(hass: HomeAssistant, dedicated: bool) -> aiohttp.ClientSession:
+    """Return the dedicated transport, or the session shared by Home Assistant."""
+    if not dedicated:
+        return async_get_clientsession(hass)
+    if (session := hass.data.get(DATA_TRANSPORT)) is None:
+        session = hass.data[DATA_TRANSPORT] = create_transport()
+
+        async def _async_close(_: Event) -> None:
+            await session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+    return session
+
+
+def create_transport() -> aiohttp.ClientSession:
+    """Create a session with its own connection pool and trace hooks.
+
+    Home Assistant's shared pool closes idle connections after 15 seconds
+    and caches DNS lookups for 10, so polls minutes apart pay for a lookup
+    and a TLS handshake every time. This pool keeps connections to the API
+    open and lookups cached for longer, which locations polling one after
+    another reuse. Compression needs nothing extra: aiohttp asks for gzip,
+    and brotli when it is installed, on every session.
+    """
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_util.get_default_context(),
+        limit_per_host=TRANSPORT_LIMIT_PER_HOST,
+        keepalive_timeout=TRANSPORT_KEEPALIVE,
+        ttl_dns_cache=TRANSPORT_DNS_TTL,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={USER_AGENT: SERVER_SOFTWARE},
+        trace_configs=[trace_config()],
+    )
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """Return trace hooks filling in the RequestTimings passed with a request.
+
+    Requests pass them as ``trace_request_ctx``; others are not timed.
+    """
+    trace = aiohttp.TraceConfig()
+    trace.on_dns_resolvehost_start.append(_on_dns_start)
+    trace.on_dns_resolvehost_end.append(_on_dns_end)
+    trace.on_connection_create_start.append(_on_connection_start)
+    trace.on_connection_create_end.append(_on_connection_end)
+    trace.on_connection_reuseconn.append(_on_connection_reused)
+    trace.on_request_headers_sent.append(_on_headers_sent)
+    # Sent once the response headers have been read
+    trace.on_request_end.append(_on_response_start)
+    return trace
+
+
+def _timings(context: SimpleNamespace) -> RequestTimings | None:
+    timings = context.trace_request_ctx
+    return timings if isinstance(timings, RequestTimings) else None
+
+
+async def _on_dns_start(_session, context: SimpleNamespace, _params) -> None:
+    context.dns_start = time.perf_counter()
+
+
+async def _on_dns_end(_session, context: SimpleNamespace, _params) -> None:
+    if (timings := _timings(context)) is not None:
+        timings.dns = time.perf_counter() - context.dns_start
+
+
+async def _on_connection_start(_session, context: SimpleNamespace, _params) -> None:
+    context.connect_start = time.perf_counter()
+
+
+async def _on_connection_end(_session, context: SimpleNamespace, _params) -> None:
+    if (timings := _timings(context)) is not None:
+        timings.connect = time.perf_counter() - context.connect_start
+
+
+async def _on_connection_reused(_session, context: SimpleNamespace, _params) -> None:
+    if (timings := _timings(context)) is not None:
+        timings.reused = True
+
+
+async def _on_headers_sent(_session, context: SimpleNamespace, _params) -> None:
+    if (timings := _timings(context)) is not None:
+        timings.headers_sent = time.perf_counter()
+
+
+async def _on_response_start(_session, context: SimpleNamespace, _params) -> None:
+    if (timings := _timings(context)) is not None:
+        timings.response_start = time.perf_counter()
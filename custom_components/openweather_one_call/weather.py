@@ -0,0 +1,229 @@
+"""Weather entity for the OpenWeatherMap One Call integration."""
+from collections.abc import Callable
+from typing import Any, Literal
+
+from homeassistant.components.weather import (
+    ATTR_CONDITION_CLEAR_NIGHT,
+    ATTR_CONDITION_SUNNY,
+    Forecast,
+    SingleCoordinatorWeatherEntity,
+    WeatherEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    UnitOfLength,
+    UnitOfPrecipitationDepth,
+    UnitOfPressure,
+    UnitOfSpeed,
+    UnitOfTemperature,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, BLOCK_CURRENT, BLOCK_DAILY, BLOCK_HOURLY, CONDITION_MAP
+from .coordinator import OpenWeatherOneCallCoordinator
+from .entity import OpenWeatherOneCallEntity
+from .snapshot import OneCallSnapshot, as_utc_datetime
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the weather platform."""
+    async_add_entities(
+        OpenWeatherOneCallWeather(coordinator, entry)
+        for coordinator in hass.data[DOMAIN][entry.entry_id]
+    )
+
+
+class OpenWeatherOneCallWeather(
+    OpenWeatherOneCallEntity, SingleCoordinatorWeatherEntity[OpenWeatherOneCallCoordinator]
+):
+    """Weather entity with the current conditions and the hourly and daily forecasts.
+
+    Forecast lists are only built when they are asked for, by a subscriber
+    or the get_forecasts service, and then kept on the snapshot of the
+    payload they came from. The hourly block is added to the scheduled
+    requests while someone is subscribed to the hourly forecast. Without
+    subscribers the get_forecasts service fetches it when the data holds
+    none, and it is kept for later calls while within its max age.
+    """
+
+    _attr_name = None
+    _attr_attribution = "Data provided by OpenWeatherMap"
+    _attr_native_temperature_unit = UnitOfTemperature.CELSIUS
+    _attr_native_pressure_unit = UnitOfPressure.HPA
+    _attr_native_wind_speed_unit = UnitOfSpeed.METERS_PER_SECOND
+    _attr_native_visibility_unit = UnitOfLength.KILOMETERS
+    _attr_native_precipitation_unit = UnitOfPrecipitationDepth.MILLIMETERS
+    _attr_supported_features = (
+        WeatherEntityFeature.FORECAST_DAILY | WeatherEntityFeature.FORECAST_HOURLY
+    )
+    _required_blocks = (BLOCK_CURRENT, BLOCK_DAILY)
+    _forecast_fallback = True
+
+    def __init__(
+        self,
+        coordinator: OpenWeatherOneCallCoordinator,
+        config_entry: ConfigEntry,
+    ):
+        """Pass coordinator to CoordinatorEntity."""
+        super().__init__(coordinator, config_entry, "weather", _weather_value)
+        self._attr_unique_id = f"{self._location_id}_weather"
+        self._release_hourly: Callable[[], None] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Release the hourly block when the entity is removed."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_release_hourly)
+
+    @callback
+    def _async_set_value(self, value) -> None:
+        current = value[0] if value is not None else {}
+        self._attr_condition = _condition(current.get("weather"))
+        self._attr_native_temperature = current.get("temp")
+        self._attr_native_apparent_temperature = current.get("feels_like")
+        self._attr_native_dew_point = current.get("dew_point")
+        self._attr_humidity = current.get("humidity")
+        self._attr_native_pressure = current.get("pressure")
+        self._attr_cloud_coverage = current.get("clouds")
+        self._attr_uv_index = current.get("uvi")
+        self._attr_native_wind_speed = current.get("wind_speed")
+        self._attr_native_wind_gust_speed = current.get("wind_gust")
+        self._attr_wind_bearing = current.get("wind_deg")
+        visibility = current.get("visibility")
+        self._attr_native_visibility = visibility / 1000 if visibility is not None else None
+
+    @callback
+    def _async_subscription_started(
+        self, forecast_type: Literal["daily", "hourly", "twice_daily"]
+    ) -> None:
+        super()._async_subscription_started(forecast_type)
+        if forecast_type == "hourly" and self._release_hourly is None:
+            self._release_hourly = self.coordinator.async_require_blocks(
+                (BLOCK_HOURLY,), refresh=False
+            )
+
+    @callback
+    def _async_subscription_ended(
+        self, forecast_type: Literal["daily", "hourly", "twice_daily"]
+    ) -> None:
+        super()._async_subscription_ended(forecast_type)
+        if forecast_type == "hourly":
+            self._async_release_hourly()
+
+    @callback
+    def _async_release_hourly(self) -> None:
+        if self._release_hourly is not None:
+            self._release_hourly()
+            self._release_hourly = None
+
+    @callback
+    def _async_forecast_daily(self) -> list[Forecast] | None:
+        """Return the daily forecast in native units."""
+        if (snapshot := self.coordinator.snapshot) is None:
+            return None
+        return snapshot.cached("forecast_daily", _daily_forecast)
+
+    async def async_forecast_hourly(self) -> list[Forecast] | None:
+        """Return the hourly forecast, fetching it for a caller without subscription.
+
+        Subscribers get the hourly block with the next scheduled request
+        instead, so opening a forecast card does not make a request.
+        """
+        if self._release_hourly is None:
+            await self.coordinator.async_fetch_blocks((BLOCK_HOURLY,))
+        return self._async_forecast_hourly()
+
+    @callback
+    def _async_forecast_hourly(self) -> list[Forecast] | None:
+        """Return the hourly forecast in native units."""
+        if (snapshot := self.coordinator.snapshot) is None:
+            return None
+        return snapshot.cached("forecast_hourly", _hourly_forecast)
+
+
+def _weather_value(snapshot: OneCallSnapshot) -> tuple[Any, ...]:
+    """Return what the entity shows, including the forecast blocks.
+
+    The forecast blocks are compared with the previous payload so forecast
+    subscribers are updated when only a forecast changed.
+    """
+    return snapshot.current, snapshot.hourly, snapshot.daily
+
+
+def _daily_forecast(snapshot: OneCallSnapshot) -> list[Forecast] | None:
+    if not snapshot.daily:
+        return None
+    return [
+        Forecast(
+            datetime=as_utc_datetime(day.get("dt")).isoformat(),
+            condition=_condition(day.get("weather")),
+            native_temperature=(day.get("temp") or {}).get("max"),
+            native_templow=(day.get("temp") or {}).get("min"),
+            native_apparent_temperature=(day.get("feels_like") or {}).get("day"),
+            native_precipitation=_precipitation(day.get("rain"), day.get("snow")),
+            precipitation_probability=_probability(day.get("pop")),
+            native_pressure=day.get("pressure"),
+            humidity=day.get("humidity"),
+            native_dew_point=day.get("dew_point"),
+            cloud_coverage=day.get("clouds"),
+            uv_index=day.get("uvi"),
+            native_wind_speed=day.get("wind_speed"),
+            native_wind_gust_speed=day.get("wind_gust"),
+            wind_bearing=day.get("wind_deg"),
+        )
+        for day in snapshot.daily
+    ]
+
+
+def _hourly_forecast(snapshot: OneCallSnapshot) -> list[Forecast] | None:
+    if not snapshot.hourly:
+        return None
+    return [
+        Forecast(
+            datetime=as_utc_datetime(hour.get("dt")).isoformat(),
+            condition=_condition(hour.get("weather")),
+            native_temperature=hour.get("temp"),
+            native_apparent_temperature=hour.get("feels_like"),
+            native_precipitation=_precipitation(
+                (hour.get("rain") or {}).get("1h"), (hour.get("snow") or {}).get("1h")
+            ),
+            precipitation_probability=_probability(hour.get("pop")),
+            native_pressure=hour.get("pressure"),
+            humidity=hour.get("humidity"),
+            native_dew_point=hour.get("dew_point"),
+            cloud_coverage=hour.get("clouds"),
+            uv_index=hour.get("uvi"),
+            native_wind_speed=hour.get("wind_speed"),
+            native_wind_gust_speed=hour.get("wind_gust"),
+            wind_bearing=hour.get("wind_deg"),
+        )
+        for hour in snapshot.hourly
+    ]
+
+
+def _condition(weather: list[dict] | None) -> str | None:
+    """Map the first weather entry to a Home Assistant condition.
+
+    Clear sky is reported as clear-night when the OpenWeatherMap icon is a
+    night icon.
+    """
+    if not weather:
+        return None
+    condition = CONDITION_MAP.get(weather[0].get("id"))
+    if condition == ATTR_CONDITION_SUNNY and weather[0].get("icon", "").endswith("n"):
+        return ATTR_CONDITION_CLEAR_NIGHT
+    return condition
+
+
+def _precipitation(rain: float | None, snow: float | None) -> float | None:
+    if rain is None and snow is None:
+        return None
+    return round((rain or 0) + (snow or 0), 2)
+
+
+def _probability(pop: float | None) -> int | None:
+    return round(pop * 100) if pop is not None else None
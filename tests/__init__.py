@@ -0,0 +1 @@
+"""Tests for the OpenWeatherMap One Call integration."""
@@ -0,0 +1,71 @@
+"""Fixtures for the OpenWeatherMap One Call tests."""
+from collections.abc import Callable
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+import pytest
+
+pytest_plugins = "pytest_homeassistant_custom_component"
+
+
+class FakeOneCallServer:
+    """Local OpenWeatherMap API answering with scripted responses.
+
+    Each request, to any endpoint, takes the next scripted response; the
+    last one is repeated once they run out. ``requests`` counts every
+    request served and ``paths`` holds the path of each.
+    """
+
+    def __init__(self):
+        self.responses: list[Callable[[], web.Response]] = []
+        self.requests = 0
+        self.paths: list[str] = []
+        self._served = 0
+        self.url = ""
+        self._server: TestServer | None = None
+
+    def respond(self, *responses: Callable[[], web.Response]) -> None:
+        self.responses = list(responses)
+        self._served = 0
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/data/{endpoint:.+}", self._handle)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        self.url = str(self._server.make_url("/data/3.0/onecall"))
+
+    def endpoint(self, path: str) -> str:
+        """Return the URL of an endpoint, as in the API_ENDPOINT constants."""
+        return str(self._server.make_url(f"/data/{path}"))
+
+    async def close(self) -> None:
+        if self._server is not None:
+            await self._server.close()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.paths.append(request.path)
+        self._served += 1
+        return self.responses[min(self._served, len(self.responses)) - 1]()
+
+
+def ok() -> web.Response:
+    return web.json_response({"lat": 52.5, "lon": 13.4, "current": {"dt": 1, "temp": 11}})
+
+
+def server_error() -> web.Response:
+    return web.Response(status=503)
+
+
+def rate_limited(retry_after: str) -> Callable[[], web.Response]:
+    return lambda: web.Response(status=429, headers={"Retry-After": retry_after})
+
+
+@pytest.fixture
+async def fake_server():
+    """Start a fake One Call server, with sockets allowed for it."""
+    server = FakeOneCallServer()
+    await server.start()
+    yield server
+    await server.close()
@@ -0,0 +1,221 @@
+"""Tests for the retries and circuit breaker of the One Call API client."""
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.openweather_one_call import coordinator
+from custom_components.openweather_one_call.budget import RequestBudget
+from custom_components.openweather_one_call.const import (
+    BLOCK_AIR_POLLUTION,
+    BLOCK_AIR_POLLUTION_FORECAST,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+from custom_components.openweather_one_call.coordinator import (
+    ApiBudgetExhausted,
+    ApiCircuitOpen,
+    ApiRateLimited,
+    ApiServerError,
+    OpenWeatherOneCallApi,
+)
+
+from .conftest import ok, rate_limited, server_error
+
+pytestmark = pytest.mark.enable_socket
+
+
+class _RecordingAsyncio:
+    """The asyncio module, with sleeps recorded instead of waited for."""
+
+    def __init__(self):
+        self.delays = []
+
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+
+    async def sleep(self, delay):
+        self.delays.append(delay)
+
+
+class _Coordinator:
+    """Stands in for a coordinator registered with the budget."""
+
+    def async_set_budget_interval(self, interval):
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recording = _RecordingAsyncio()
+    monkeypatch.setattr(coordinator, "asyncio", recording)
+    return recording.delays
+
+
+@pytest.fixture
+async def session():
+    async with aiohttp.ClientSession() as session:
+        yield session
+
+
+@pytest.fixture
+def api(fake_server, session, monkeypatch):
+    monkeypatch.setattr(coordinator, "API_ENDPOINT", fake_server.url)
+    return OpenWeatherOneCallApi(session, "key", 52.5, 13.4)
+
+
+def test_backoff_grows_with_jitter():
+    for attempt in range(6):
+        delay = min(RETRY_BASE_DELAY * 2**attempt, RETRY_MAX_DELAY)
+        samples = {coordinator._backoff(attempt) for _ in range(50)}
+        assert all(delay / 2 <= sample <= delay for sample in samples)
+        assert len(samples) > 1
+
+
+async def test_server_errors_are_retried_with_backoff(fake_server, api, sleeps, monkeypatch):
+    monkeypatch.setattr(coordinator.random, "uniform", lambda low, high: high)
+    fake_server.respond(server_error, server_error, ok)
+
+    data = await api.fetch_data()
+
+    assert data["current"]["temp"] == 11
+    assert fake_server.requests == 3
+    assert sleeps == [RETRY_BASE_DELAY, RETRY_BASE_DELAY * 2]
+    assert api.metrics.retries == 2
+    assert api.metrics.errors["server"] == 2
+    assert api.breaker.failures == 0
+
+
+async def test_retries_are_bounded(fake_server, api, sleeps):
+    fake_server.respond(server_error)
+
+    with pytest.raises(ApiServerError):
+        await api.fetch_data()
+
+    assert fake_server.requests == RETRY_ATTEMPTS + 1
+    assert len(sleeps) == RETRY_ATTEMPTS
+
+
+async def test_rate_limit_waits_for_retry_after(fake_server, api, sleeps):
+    fake_server.respond(rate_limited("7"), ok)
+
+    await api.fetch_data()
+
+    assert sleeps == [7]
+    assert api.metrics.errors["rate_limited"] == 1
+    # Rate limits are not outages
+    assert api.breaker.failures == 0
+
+
+async def test_long_rate_limit_is_not_waited_for(fake_server, api, sleeps):
+    fake_server.respond(rate_limited(str(RETRY_MAX_DELAY + 1)))
+
+    with pytest.raises(ApiRateLimited) as err:
+        await api.fetch_data()
+
+    assert err.value.retry_after == RETRY_MAX_DELAY + 1
+    assert fake_server.requests == 1
+    assert sleeps == []
+
+
+async def test_breaker_opens_half_opens_and_reopens(fake_server, api, sleeps):
+    fake_server.respond(server_error)
+
+    with pytest.raises(ApiServerError):
+        await api.fetch_data()
+    # The failure reaching the threshold opens the breaker and stops retrying
+    with pytest.raises(ApiServerError):
+        await api.fetch_data()
+    assert fake_server.requests == BREAKER_FAILURE_THRESHOLD
+    assert api.breaker.is_open
+
+    with pytest.raises(ApiCircuitOpen):
+        await api.fetch_data()
+    assert fake_server.requests == BREAKER_FAILURE_THRESHOLD
+
+    # After the reset timeout a single trial request is made
+    api.breaker._opened_at -= BREAKER_RESET_TIMEOUT
+    with pytest.raises(ApiServerError):
+        await api.fetch_data()
+    assert fake_server.requests == BREAKER_FAILURE_THRESHOLD + 1
+    assert api.breaker.reset_timeout == BREAKER_RESET_TIMEOUT * 2
+    with pytest.raises(ApiCircuitOpen):
+        await api.fetch_data()
+
+    # The doubled timeout has to pass before the next trial, which closes it
+    api.breaker._opened_at -= BREAKER_RESET_TIMEOUT
+    with pytest.raises(ApiCircuitOpen):
+        await api.fetch_data()
+    api.breaker._opened_at -= BREAKER_RESET_TIMEOUT
+    fake_server.respond(ok)
+    await api.fetch_data()
+    assert not api.breaker.is_open
+    assert api.breaker.reset_timeout == BREAKER_RESET_TIMEOUT
+
+
+async def test_every_attempt_counts_against_the_budget(hass, fake_server, api, sleeps):
+    api.budget = RequestBudget(hass, "key")
+    unregister = api.budget.async_register(_Coordinator(), 4, 1)
+    fake_server.respond(server_error, server_error, ok)
+
+    await api.fetch_data()
+    assert api.budget.used == 3
+
+    # The retry that would exceed the limit is not made
+    fake_server.respond(server_error)
+    with pytest.raises(ApiBudgetExhausted):
+        await api.fetch_data()
+    assert api.budget.used == 4
+    assert fake_server.requests == 4
+    unregister()
+
+
+async def test_history_failures_do_not_pause_polling(fake_server, api, sleeps, monkeypatch):
+    monkeypatch.setattr(
+        coordinator, "TIMEMACHINE_ENDPOINT", fake_server.endpoint("3.0/onecall/timemachine")
+    )
+    fake_server.respond(server_error)
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(ApiServerError):
+            await api.fetch_timemachine(1)
+    # Not retried, and the history breaker is the one that opens
+    assert fake_server.requests == BREAKER_FAILURE_THRESHOLD
+    assert sleeps == []
+    assert api.history_breaker.is_open
+    with pytest.raises(ApiCircuitOpen):
+        await api.fetch_timemachine(1)
+
+    assert not api.breaker.is_open
+    fake_server.respond(ok)
+    await api.fetch_data()
+    assert fake_server.paths[-1] == "/data/3.0/onecall"
+
+
+async def test_dataset_failures_do_not_pause_polling(fake_server, api, sleeps, monkeypatch):
+    monkeypatch.setattr(
+        coordinator,
+        "DATASET_ENDPOINTS",
+        {
+            BLOCK_AIR_POLLUTION: fake_server.endpoint("2.5/air_pollution"),
+            BLOCK_AIR_POLLUTION_FORECAST: fake_server.endpoint("2.5/air_pollution/forecast"),
+        },
+    )
+    fake_server.respond(server_error)
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        for dataset in (BLOCK_AIR_POLLUTION, BLOCK_AIR_POLLUTION_FORECAST):
+            with pytest.raises(ApiServerError):
+                await api.fetch_dataset(dataset)
+    # Not retried, and each dataset opens its own breaker
+    assert fake_server.requests == 2 * BREAKER_FAILURE_THRESHOLD
+    assert sleeps == []
+    assert all(breaker.is_open for breaker in api.dataset_breakers.values())
+
+    assert not api.breaker.is_open
+    fake_server.respond(ok)
+    await api.fetch_data()
+    assert fake_server.paths[-1] == "/data/3.0/onecall"
@@ -0,0 +1,22 @@
+"""Tests for the request budget shared by the locations of an API key."""
+from custom_components.openweather_one_call.budget import RequestBudget
+
+
+class _Coordinator:
+    """Stands in for a coordinator registered with the budget."""
+
+    def async_set_budget_interval(self, interval):
+        pass
+
+
+async def test_backfills_share_one_reservation(hass):
+    budget = RequestBudget(hass, "key")
+    unregister = budget.async_register(_Coordinator(), 100, 1)
+
+    # Two locations asking at the same time split half of the remaining budget
+    assert budget.async_reserve_backfill(24) == 24
+    assert budget.async_reserve_backfill(24) == 24
+    assert budget.async_reserve_backfill(24) == 2
+    assert budget.async_reserve_backfill(24) == 0
+    assert budget.remaining == 100
+    unregister()
@@ -0,0 +1,113 @@
+"""Tests for the refresh scheduling of the One Call coordinator."""
+from datetime import timedelta
+
+import aiohttp
+from aiohttp import web
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.openweather_one_call import coordinator as coordinator_module
+from custom_components.openweather_one_call.const import (
+    ACTIVITY_ACTIVE,
+    BLOCK_AIR_POLLUTION,
+    BLOCK_CURRENT,
+    MIN_REFRESH_DELAY,
+)
+from custom_components.openweather_one_call.coordinator import (
+    OpenWeatherOneCallApi,
+    OpenWeatherOneCallCoordinator,
+)
+
+from .conftest import ok
+
+INTERVAL = timedelta(minutes=20)
+
+
+@pytest.fixture
+async def coordinator(hass):
+    coordinator = OpenWeatherOneCallCoordinator(
+        hass, OpenWeatherOneCallApi(None, "key", 52.5, 13.4), INTERVAL
+    )
+    yield coordinator
+    coordinator._async_unsub_refresh()
+
+
+async def test_reschedule_moves_the_timer(coordinator):
+    coordinator.last_fetch = dt_util.utcnow() - timedelta(minutes=5)
+    coordinator._schedule_refresh()
+
+    coordinator.async_reschedule()
+
+    assert timedelta(minutes=14) < coordinator.update_interval <= timedelta(minutes=15)
+    assert coordinator._unsub_refresh is not None
+
+
+async def test_overdue_reschedule_keeps_polling(coordinator):
+    coordinator.last_fetch = dt_util.utcnow() - 2 * INTERVAL
+    coordinator._schedule_refresh()
+
+    coordinator.async_reschedule()
+
+    # A zero interval would disable polling
+    assert coordinator.update_interval == timedelta(seconds=MIN_REFRESH_DELAY)
+    assert coordinator._unsub_refresh is not None
+
+
+async def test_adopting_a_payload_due_in_active_weather_keeps_polling(coordinator):
+    # Alerts make the weather active, which halves the poll interval
+    data = {"current": {"dt": 1, "temp": 11}, "alerts": [{"event": "Wind gusts"}]}
+    fetched = dt_util.utcnow() - INTERVAL * 3 / 4
+
+    assert coordinator.async_adopt(data, fetched, ("current", "alerts"))
+
+    assert coordinator.activity == ACTIVITY_ACTIVE
+    assert coordinator.update_interval == timedelta(seconds=MIN_REFRESH_DELAY)
+
+
+@pytest.mark.enable_socket
+async def test_first_refresh_with_fewer_blocks_than_the_defaults(hass, fake_server, monkeypatch):
+    monkeypatch.setattr(coordinator_module, "API_ENDPOINT", fake_server.url)
+    fake_server.respond(ok)
+    async with aiohttp.ClientSession() as session:
+        coordinator = OpenWeatherOneCallCoordinator(
+            hass, OpenWeatherOneCallApi(session, "key", 52.5, 13.4), INTERVAL
+        )
+        release = coordinator.async_require_blocks((BLOCK_CURRENT,))
+
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert coordinator.data["current"]["temp"] == 11
+        release()
+        coordinator._async_unsub_refresh()
+
+
+def _air_pollution() -> web.Response:
+    return web.json_response({"list": [{"dt": 1, "main": {"aqi": 2}}]})
+
+
+@pytest.mark.enable_socket
+async def test_only_datasets_due_makes_no_one_call_request(hass, fake_server, monkeypatch):
+    monkeypatch.setattr(
+        coordinator_module,
+        "DATASET_ENDPOINTS",
+        {BLOCK_AIR_POLLUTION: fake_server.endpoint("2.5/air_pollution")},
+    )
+    fake_server.respond(_air_pollution)
+    async with aiohttp.ClientSession() as session:
+        coordinator = OpenWeatherOneCallCoordinator(
+            hass, OpenWeatherOneCallApi(session, "key", 52.5, 13.4), INTERVAL
+        )
+        coordinator.data = {"timezone_offset": 3600, "current": {"dt": 1}}
+        release = coordinator.async_require_blocks((BLOCK_AIR_POLLUTION,), refresh=False)
+
+        await coordinator.async_refresh()
+
+        assert fake_server.paths == ["/data/2.5/air_pollution"]
+        assert coordinator.data == {
+            "timezone_offset": 3600,
+            BLOCK_AIR_POLLUTION: {"dt": 1, "main": {"aqi": 2}},
+        }
+        release()
+        coordinator._async_unsub_refresh()
@@ -0,0 +1,65 @@
+"""Tests for aligning polls to the cadence of the current conditions."""
+from custom_components.openweather_one_call.const import FRESHNESS_MARGIN
+from custom_components.openweather_one_call.freshness import FreshnessTracker
+
+CADENCE = 600
+PHASE = 37
+
+
+def _quantized(now: float) -> int:
+    """Return current.dt of a provider updating every CADENCE seconds."""
+    return int((now - PHASE) // CADENCE * CADENCE + PHASE)
+
+
+def _observe(tracker: FreshnessTracker, dt: int) -> bool:
+    return tracker.observe({"current": {"dt": dt}})
+
+
+def test_quantized_polls_follow_the_update_nearest_due():
+    tracker = FreshnessTracker()
+    for now in (1000, 1600, 1650):
+        _observe(tracker, _quantized(now))
+    assert tracker.cadence == CADENCE
+    assert tracker.stale == 1
+
+    now = 1650
+    delay = tracker.aligned_delay(now, now + 900)
+
+    assert (now + delay - PHASE) % CADENCE == FRESHNESS_MARGIN
+    assert abs(now + delay - (now + 900)) <= CADENCE / 2
+
+
+def test_quantized_polls_keep_the_budget_rate():
+    tracker = FreshnessTracker()
+    # A stale response shows the provider publishes on a cadence
+    for now in (4340, 4940, 4990):
+        _observe(tracker, _quantized(now))
+    now, delays, stale = 5500.0, [], 0
+    for _ in range(200):
+        stale += _observe(tracker, _quantized(now))
+        delay = tracker.aligned_delay(now, now + CADENCE)
+        delays.append(CADENCE if delay is None else delay)
+        # Timers fire up to a few seconds early
+        now += delays[-1] - 5
+
+    assert stale == 0
+    assert abs(sum(delays) / len(delays) - CADENCE) < CADENCE / 10
+
+
+def test_request_time_dt_keeps_the_budget_interval():
+    tracker = FreshnessTracker()
+    now = 0.0
+    for _ in range(50):
+        # Each response is calculated when it is requested
+        assert not _observe(tracker, int(now))
+        assert tracker.aligned_delay(now, now + CADENCE) is None
+        now += CADENCE
+
+
+def test_alignment_never_moves_far_past_due():
+    tracker = FreshnessTracker()
+    for dt in (0, 3600, 3600):
+        _observe(tracker, dt)
+
+    # The next hourly update is far beyond the budget slot
+    assert tracker.aligned_delay(3700, 3700 + CADENCE) is None
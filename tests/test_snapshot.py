@@ -0,0 +1,26 @@
+"""Tests for the change detection of One Call snapshots."""
+import pytest
+
+from custom_components.openweather_one_call.snapshot import OneCallSnapshot
+
+
+def _snapshot(temp: float) -> OneCallSnapshot:
+    return OneCallSnapshot({"current": {"temp": temp}}, {"temp": lambda s: s.current["temp"]})
+
+
+@pytest.mark.parametrize(("old", "new"), [(12.3, 12.4), (0.2, 0.3), (1.1, 1.2), (0.3, 0.2)])
+def test_threshold_sized_steps_are_changes(old, new):
+    snapshot = _snapshot(new)
+
+    assert snapshot.changed_keys(_snapshot(old), {"temp": 0.1}) == {"temp"}
+    assert snapshot.values["temp"] == new
+
+
+def test_smaller_steps_keep_the_previous_value():
+    previous = _snapshot(12.3)
+    snapshot = _snapshot(12.35)
+
+    assert snapshot.changed_keys(previous, {"temp": 0.1}) == set()
+    assert snapshot.values["temp"] == 12.3
+    # The kept value is compared with the next one, so steps cannot add up
+    assert _snapshot(12.4).changed_keys(snapshot, {"temp": 0.1}) == {"temp"}